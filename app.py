@@ -3,17 +3,32 @@ Enhanced Flask Web Application for ADAS System
 Modern, interactive UI with real-time monitoring and controls
 """
 
+import atexit
 import cv2
+import numpy as np
 import os
+import shutil
 import threading
 import time
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, render_template, Response, jsonify, request, send_from_directory
 from werkzeug.utils import secure_filename
-from enhanced_adas_system import EnhancedADASSystem
+from enhanced_adas_system import EnhancedADASSystem, make_fast_processor
 from utils.config_loader import ConfigLoader
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,6 +39,7 @@ app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB
 app.config['SECRET_KEY'] = 'adas-enhanced-secret-key'
 
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
+_ALLOWED_SUFFIXES = frozenset('.' + ext for ext in ALLOWED_EXTENSIONS)
 
 # Global variables
 enhanced_adas = None
@@ -33,6 +49,16 @@ processing_active = False
 frame_lock = threading.Lock()
 config_loader = None
 
+# Uploaded videos are opened off the request thread; clients poll the job
+upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='adas-upload')
+# Serializes every stop -> swap capture -> start sequence. Each new source
+# or stop bumps the generation, so a queued upload job can tell it is stale.
+source_lock = threading.Lock()
+source_generation = 0
+upload_jobs = {}
+MAX_UPLOAD_JOBS = 16
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 # Processing statistics
 processing_stats = {
     'total_frames': 0,
@@ -47,10 +73,88 @@ processing_stats = {
     'critical_alerts': 0
 }
 
+JPEG_QUALITY = 85
+
+# Adaptive stream quality: drop to JPEG_QUALITY_LOW when the smoothed
+# process+encode latency eats most of the frame budget, go up to
+# JPEG_QUALITY_HIGH when there is plenty of headroom
+JPEG_QUALITY_LOW = 70
+JPEG_QUALITY_HIGH = 90
+LATENCY_EMA_ALPHA = 0.1
+
+# OpenCL (UMat) path for the OpenCV encoder; opt-in since some drivers,
+# especially on ARM boards, are slower than the CPU path
+USE_OPENCL = os.environ.get('ADAS_OPENCL') == '1' and cv2.ocl.haveOpenCL()
+if USE_OPENCL:
+    cv2.ocl.setUseOpenCL(True)
+
+# Shared libjpeg-turbo encoder (the handle is reusable across frames and threads)
+_tj = None
+if TurboJPEG is not None:
+    try:
+        _tj = TurboJPEG()
+    except Exception as e:
+        logger.warning(f"libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower() in _ALLOWED_SUFFIXES
+
+
+def _encode_jpeg(frame, quality=JPEG_QUALITY):
+    """Encode a BGR frame to JPEG bytes, preferring libjpeg-turbo"""
+    if _tj is not None:
+        return _tj.encode(frame, quality=quality, pixel_format=TJPF_BGR,
+                          jpeg_subsample=TJSAMP_420)
+    
+    src = cv2.UMat(frame) if USE_OPENCL else frame
+    ret, buffer = cv2.imencode('.jpg', src, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ret:
+        return None
+    return buffer.tobytes()
+
+
+def _gstreamer_available():
+    """Check whether OpenCV was built with the GStreamer backend"""
+    for line in cv2.getBuildInformation().splitlines():
+        if line.strip().startswith('GStreamer:'):
+            return 'YES' in line
+    return False
+
+
+GSTREAMER_AVAILABLE = _gstreamer_available()
+
+
+def get_video_capture(source):
+    """
+    Open a video capture, preferring a hardware-decoding GStreamer pipeline
+    
+    Args:
+        source: Webcam index (int) or path to a video file
+        
+    Returns:
+        Opened cv2.VideoCapture (may be unopened if the source is unavailable)
+    """
+    if GSTREAMER_AVAILABLE:
+        if isinstance(source, int):
+            # Let the camera send MJPEG and decode it with jpegdec (libjpeg-turbo)
+            pipeline = (f"v4l2src device=/dev/video{source} ! "
+                        "image/jpeg,width=1280,height=720,framerate=30/1 ! jpegdec ! "
+                        "videoconvert ! video/x-raw,format=BGR ! appsink drop=1 max-buffers=1")
+        else:
+            # decodebin picks VAAPI/NVDEC decoders when they are installed.
+            # Files must not drop buffers, so the appsink blocks the decoder instead
+            pipeline = (f'filesrc location="{source}" ! decodebin ! '
+                        "videoconvert ! video/x-raw,format=BGR ! appsink max-buffers=1")
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            logger.info(f"Opened {source} with GStreamer pipeline")
+            return cap
+        cap.release()
+        logger.warning(f"GStreamer pipeline failed for {source}, using default backend")
+    
+    return cv2.VideoCapture(source)
 
 
 def init_enhanced_adas():
@@ -60,80 +164,199 @@ def init_enhanced_adas():
         logger.info("Initializing Enhanced ADAS System...")
         config_loader = ConfigLoader()
         enhanced_adas = EnhancedADASSystem(yolo_model='yolov8n.pt', conf_threshold=0.5)
+        # Stop the system's worker threads when the server exits
+        atexit.register(enhanced_adas.shutdown)
         logger.info("Enhanced ADAS System initialized!")
     return enhanced_adas
 
 
-def generate_frames():
-    """Generate video frames with ADAS processing"""
-    global video_capture, processing_active, enhanced_adas, processing_stats
+class _LatestFrame:
+    """
+    Single-slot holder for the most recently encoded frame
     
-    if enhanced_adas is None:
-        enhanced_adas = init_enhanced_adas()
+    There is one writer (the producer) and many readers (stream clients).
+    The slot is an immutable (data, frame_id) tuple replaced with a single
+    reference store, so readers never take a lock. Each publish swaps in a
+    fresh Event and sets the old one, which wakes everyone waiting on it.
+    """
     
-    processing_stats['start_time'] = time.time()
-    processing_stats['processed_frames'] = 0
+    __slots__ = ('_state', '_event')
     
-    while processing_active:
+    def __init__(self):
+        self._state = (None, 0)
+        self._event = threading.Event()
+    
+    def set(self, data):
+        """Publish a new (frame_bytes, quality) entry and wake up waiting clients"""
+        # Store the frame before swapping the event: a reader that already
+        # holds the new event is then guaranteed to see the new frame
+        self._state = (data, self._state[1] + 1)
+        event, self._event = self._event, threading.Event()
+        event.set()
+    
+    def clear(self):
+        """Drop the current frame"""
+        self._state = (None, self._state[1])
+    
+    def wait_next(self, last_id, timeout=1.0):
+        """
+        Wait for a frame newer than last_id
+        
+        Returns:
+            Tuple of (data, frame_id); frame_id equals last_id on timeout
+        """
+        event = self._event
+        state = self._state
+        if state[1] == last_id:
+            event.wait(timeout)
+            state = self._state
+        return state
+
+
+latest_frame = _LatestFrame()
+producer_thread = None
+producer_stop = threading.Event()
+
+
+def _producer_loop(stop_event):
+    """Capture, process and encode frames into latest_frame until stopped"""
+    adas = init_enhanced_adas()
+    
+    # Pace output to the source frame rate, sleeping only for what is left
+    # of each frame's time budget
+    with frame_lock:
+        source_fps = video_capture.get(cv2.CAP_PROP_FPS) if video_capture is not None else 0
+    frame_interval = 1.0 / (source_fps if source_fps and source_fps > 0 else 30.0)
+    next_deadline = time.monotonic()
+    
+    quality = JPEG_QUALITY
+    ema_latency = None
+    # Specialized to the source's frame shape after the first read
+    process = None
+    # The capture decodes into one buffer for the life of the stream; it is
+    # safe to reuse because each frame is encoded before the next read
+    read_buf = None
+    
+    while not stop_event.is_set():
         try:
+            # The lock only guards the capture against the control routes
             with frame_lock:
-                if video_capture is None or not video_capture.isOpened():
-                    time.sleep(0.1)
-                    continue
-                
-                ret, frame = video_capture.read()
-                if not ret:
-                    if current_video_path:
+                cap = video_capture
+                ret, frame = False, None
+                if cap is not None and cap.isOpened():
+                    ret, frame = cap.read(read_buf)
+                    if not ret and current_video_path:
                         # Loop video
-                        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                        ret, frame = video_capture.read()
-                        if not ret:
-                            time.sleep(0.1)
-                            continue
-                    else:
-                        time.sleep(0.033)
-                        continue
-                
-                # Process frame with enhanced ADAS
-                try:
-                    processed_frame = enhanced_adas.process_frame(frame)
-                    
-                    # Update statistics from system status
-                    system_status = enhanced_adas.get_system_status()
-                    if system_status.get('fcws_state') == 'WARNING':
-                        processing_stats['warnings'] += 1
-                    elif system_status.get('fcws_state') == 'CRITICAL':
-                        processing_stats['critical_alerts'] += 1
-                    
-                except Exception as e:
-                    logger.warning(f"ADAS processing error: {e}")
-                    processed_frame = frame
-                
-                # Update statistics
-                processing_stats['processed_frames'] += 1
-                elapsed = time.time() - processing_stats['start_time']
-                if elapsed > 0:
-                    processing_stats['current_fps'] = processing_stats['processed_frames'] / elapsed
-                
-                # Encode frame
-                ret, buffer = cv2.imencode('.jpg', processed_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if not ret:
-                    continue
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        ret, frame = cap.read(read_buf)
+            
+            if not ret:
+                # Webcam: wait for the next frame, otherwise back off
+                stop_event.wait(0.033 if cap is not None and not current_video_path else 0.1)
+                continue
+            
+            if read_buf is None:
+                read_buf = np.empty(frame.shape, dtype=np.uint8)
+            
+            # Process frame with enhanced ADAS
+            work_start = time.monotonic()
+            try:
+                if process is None:
+                    process = make_fast_processor(adas, frame)
+                processed_frame = process(frame)
                 
-                frame_bytes = buffer.tobytes()
+                # Update statistics from system status
+                system_status = adas.get_system_status()
+                if system_status.get('fcws_state') == 'WARNING':
+                    processing_stats['warnings'] += 1
+                elif system_status.get('fcws_state') == 'CRITICAL':
+                    processing_stats['critical_alerts'] += 1
                 
-                # Yield frame
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+            except Exception as e:
+                logger.warning(f"ADAS processing error: {e}")
+                processed_frame = frame
+            
+            # Update statistics
+            processing_stats['processed_frames'] += 1
+            elapsed = time.time() - processing_stats['start_time']
+            if elapsed > 0:
+                processing_stats['current_fps'] = processing_stats['processed_frames'] / elapsed
+            
+            # Encode once for all connected clients
+            frame_bytes = _encode_jpeg(processed_frame, quality)
+            if frame_bytes is not None:
+                latest_frame.set((frame_bytes, quality))
+            
+            latency = time.monotonic() - work_start
+            if ema_latency is None:
+                ema_latency = latency
+            else:
+                ema_latency += LATENCY_EMA_ALPHA * (latency - ema_latency)
+            if ema_latency > frame_interval * 0.8:
+                quality = JPEG_QUALITY_LOW
+            elif ema_latency < frame_interval * 0.4:
+                quality = JPEG_QUALITY_HIGH
         
         except Exception as e:
-            logger.error(f"Error in frame generation: {e}")
+            logger.error(f"Error in frame producer: {e}")
             processing_stats['errors'] += 1
             processing_stats['last_error'] = str(e)
-            time.sleep(0.1)
+            stop_event.wait(0.1)
+            continue
+        
+        next_deadline += frame_interval
+        delay = next_deadline - time.monotonic()
+        if delay > 0:
+            stop_event.wait(delay)
+        else:
+            # Running behind; don't try to catch up with a burst
+            next_deadline = time.monotonic()
+
+
+def _start_producer():
+    """Start the background capture/processing thread"""
+    global producer_thread, producer_stop
+    producer_stop = threading.Event()
+    producer_thread = threading.Thread(target=_producer_loop, args=(producer_stop,),
+                                       name='adas-producer', daemon=True)
+    producer_thread.start()
+
+
+def _stop_producer():
+    """Stop the background thread and wait for its current frame to finish"""
+    global producer_thread
+    producer_stop.set()
+    if producer_thread is not None:
+        producer_thread.join(timeout=2.0)
+        producer_thread = None
+    latest_frame.clear()
+
+
+# Multipart headers are built once per quality level
+_PART_HEADERS = {
+    q: b'--frame\r\nContent-Type: image/jpeg\r\nX-JPEG-Quality: %d\r\n\r\n' % q
+    for q in (JPEG_QUALITY_LOW, JPEG_QUALITY, JPEG_QUALITY_HIGH)
+}
+_PART_SUFFIX = b'\r\n'
+
+
+def generate_frames():
+    """Stream the frames published by the producer thread"""
+    last_id = 0
+    
+    while processing_active:
+        # Clients slower than the producer simply skip to the newest frame
+        data, frame_id = latest_frame.wait_next(last_id, timeout=1.0)
+        if frame_id == last_id or data is None:
             continue
+        last_id = frame_id
+        frame_bytes, quality = data
         
-        time.sleep(0.033)  # ~30 FPS
+        # Yield the pieces separately so the shared JPEG isn't copied into a
+        # new buffer for every client
+        yield _PART_HEADERS[quality]
+        yield frame_bytes
+        yield _PART_SUFFIX
 
 
 # ============================================================================
@@ -200,49 +423,53 @@ def serve_assets(filename):
 @app.route('/api/video/start_webcam', methods=['POST'])
 def start_webcam():
     """Start webcam streaming"""
-    global video_capture, processing_active, current_video_path
+    global video_capture, processing_active, current_video_path, source_generation
     
     try:
         logger.info("Starting webcam...")
         
-        # Stop any existing stream
-        processing_active = False
-        time.sleep(0.2)
-        
-        with frame_lock:
-            if video_capture is not None:
-                video_capture.release()
-            
-            # Try to open webcam
-            video_capture = cv2.VideoCapture(0)
+        with source_lock:
+            source_generation += 1
             
-            if not video_capture.isOpened():
-                logger.error("Failed to open webcam")
-                return jsonify({'status': 'error', 'message': 'Failed to open webcam'}), 500
+            # Stop any existing stream
+            processing_active = False
+            _stop_producer()
             
-            # Set webcam properties
-            video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            video_capture.set(cv2.CAP_PROP_FPS, 30)
+            with frame_lock:
+                if video_capture is not None:
+                    video_capture.release()
+                
+                # Try to open webcam
+                video_capture = get_video_capture(0)
+                
+                if not video_capture.isOpened():
+                    logger.error("Failed to open webcam")
+                    return jsonify({'status': 'error', 'message': 'Failed to open webcam'}), 500
+                
+                # Set webcam properties
+                video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+                video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+                video_capture.set(cv2.CAP_PROP_FPS, 30)
+                
+                # Verify we can read a frame
+                ret, test_frame = video_capture.read()
+                if not ret:
+                    video_capture.release()
+                    video_capture = None
+                    logger.error("Failed to read from webcam")
+                    return jsonify({'status': 'error', 'message': 'Failed to read from webcam'}), 500
+                
+                current_video_path = None
             
-            # Verify we can read a frame
-            ret, test_frame = video_capture.read()
-            if not ret:
-                video_capture.release()
-                video_capture = None
-                logger.error("Failed to read from webcam")
-                return jsonify({'status': 'error', 'message': 'Failed to read from webcam'}), 500
+            processing_stats['start_time'] = time.time()
+            processing_stats['processed_frames'] = 0
+            processing_stats['warnings'] = 0
+            processing_stats['critical_alerts'] = 0
+            processing_stats['source'] = 'webcam'
+            processing_active = True
+            _start_producer()
             
-            current_video_path = None
-        
-        processing_stats['start_time'] = time.time()
-        processing_stats['processed_frames'] = 0
-        processing_stats['warnings'] = 0
-        processing_stats['critical_alerts'] = 0
-        processing_stats['source'] = 'webcam'
-        processing_active = True
-        
-        logger.info("Webcam started successfully")
+            logger.info("Webcam started successfully")
         return jsonify({'status': 'success', 'message': 'Webcam started successfully'})
     
     except Exception as e:
@@ -252,8 +479,8 @@ def start_webcam():
 
 @app.route('/api/video/upload', methods=['POST'])
 def upload_video():
-    """Upload and process video file"""
-    global video_capture, processing_active, current_video_path
+    """Upload a video file and open it for processing in the background"""
+    global processing_active, source_generation
     
     try:
         logger.info("Video upload request received")
@@ -268,16 +495,22 @@ def upload_video():
             return jsonify({'status': 'error', 'message': 'No file selected'}), 400
         
         if file and allowed_file(file.filename):
-            # Stop any existing stream
-            processing_active = False
-            time.sleep(0.2)
+            # Stop any existing stream; the job only starts the new one if
+            # nothing else happened in between
+            with source_lock:
+                source_generation += 1
+                generation = source_generation
+                processing_active = False
+                _stop_producer()
             
             os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
             
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             logger.info(f"Saving video to: {filepath}")
-            file.save(filepath)
+            # Stream the upload to disk in 1 MiB chunks instead of buffering it
+            with open(filepath, 'wb', buffering=UPLOAD_CHUNK_SIZE) as f:
+                shutil.copyfileobj(file.stream, f, length=UPLOAD_CHUNK_SIZE)
             
             # Verify file was saved
             if not os.path.exists(filepath):
@@ -287,23 +520,66 @@ def upload_video():
             file_size = os.path.getsize(filepath)
             logger.info(f"File saved successfully. Size: {file_size} bytes")
             
+            # Opening the capture can take a while; do it in the background
+            job_id = uuid.uuid4().hex
+            upload_jobs[job_id] = {'state': 'pending', 'filename': filename}
+            while len(upload_jobs) > MAX_UPLOAD_JOBS:
+                upload_jobs.pop(next(iter(upload_jobs)))
+            upload_executor.submit(_open_video_job, job_id, filepath, filename, generation)
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Video uploaded, opening stream',
+                'filename': filename,
+                'job_id': job_id
+            }), 202
+        else:
+            logger.error(f"Invalid file type: {file.filename}")
+            return jsonify({'status': 'error', 'message': 'Invalid file type. Supported: MP4, AVI, MOV, MKV, WEBM'}), 400
+    
+    except Exception as e:
+        logger.error(f"Upload error: {e}")
+        return jsonify({'status': 'error', 'message': f'Upload error: {str(e)}'}), 500
+
+
+def _open_video_job(job_id, filepath, filename, generation):
+    """
+    Open an uploaded video and start processing it (runs in upload_executor)
+    
+    generation is source_generation when the upload was accepted; if a stop
+    or another source arrived since, the video is not started.
+    """
+    global video_capture, processing_active, current_video_path
+    
+    job = upload_jobs.get(job_id, {})
+    try:
+        cap = get_video_capture(filepath)
+        if not cap.isOpened():
+            logger.error(f"Failed to open video file: {filepath}")
+            job.update(state='error', message='Failed to open video file')
+            return
+        
+        # Get video properties
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        logger.info(f"Video properties - Frames: {frame_count}, FPS: {fps}, Size: {width}x{height}")
+        
+        with source_lock:
+            if generation != source_generation:
+                cap.release()
+                logger.info(f"Not starting {filename}: superseded by a newer request")
+                job.update(state='cancelled', message='Superseded by a newer request')
+                return
+            
+            processing_active = False
+            _stop_producer()
+            
             with frame_lock:
                 if video_capture is not None:
                     video_capture.release()
-                
-                # Try to open the video
-                video_capture = cv2.VideoCapture(filepath)
-                if not video_capture.isOpened():
-                    logger.error(f"Failed to open video file: {filepath}")
-                    return jsonify({'status': 'error', 'message': 'Failed to open video file'}), 500
-                
-                # Get video properties
-                frame_count = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-                fps = video_capture.get(cv2.CAP_PROP_FPS)
-                width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                logger.info(f"Video properties - Frames: {frame_count}, FPS: {fps}, Size: {width}x{height}")
-                
+                video_capture = cap
                 current_video_path = filepath
             
             processing_stats['start_time'] = time.time()
@@ -312,43 +588,37 @@ def upload_video():
             processing_stats['critical_alerts'] = 0
             processing_stats['source'] = f'video: {filename}'
             processing_active = True
-            
-            logger.info(f"Video started: {filename}")
-            
-            return jsonify({
-                'status': 'success',
-                'message': 'Video started successfully',
-                'filename': filename,
-                'frames': frame_count,
-                'fps': fps,
-                'resolution': f'{width}x{height}'
-            })
-        else:
-            logger.error(f"Invalid file type: {file.filename}")
-            return jsonify({'status': 'error', 'message': 'Invalid file type. Supported: MP4, AVI, MOV, MKV, WEBM'}), 400
+            _start_producer()
+        
+        logger.info(f"Video started: {filename}")
+        job.update(state='ready', frames=frame_count, fps=fps, resolution=f'{width}x{height}')
     
     except Exception as e:
-        logger.error(f"Upload error: {e}")
-        return jsonify({'status': 'error', 'message': f'Upload error: {str(e)}'}), 500
+        logger.error(f"Error opening video {filepath}: {e}")
+        job.update(state='error', message=str(e))
 
 
 @app.route('/api/video/stop', methods=['POST'])
 def stop_video():
     """Stop video streaming"""
-    global video_capture, processing_active, current_video_path
+    global video_capture, processing_active, current_video_path, source_generation
     
     try:
         logger.info("Stopping video stream...")
-        processing_active = False
-        time.sleep(0.1)
-        
-        with frame_lock:
-            if video_capture is not None:
-                video_capture.release()
-                video_capture = None
-        
-        current_video_path = None
-        processing_stats['source'] = 'idle'
+        # Flag first so stream clients return, then stop the producer
+        # before releasing the capture it reads from
+        with source_lock:
+            source_generation += 1
+            processing_active = False
+            _stop_producer()
+            
+            with frame_lock:
+                if video_capture is not None:
+                    video_capture.release()
+                    video_capture = None
+                current_video_path = None
+            
+            processing_stats['source'] = 'idle'
         logger.info("Video stream stopped")
         return jsonify({'status': 'success', 'message': 'Streaming stopped'})
     except Exception as e:
@@ -377,6 +647,10 @@ def get_status():
             system_status = enhanced_adas.get_system_status()
             status_info['system'] = system_status
         
+        job_id = request.args.get('job')
+        if job_id:
+            status_info['upload_job'] = upload_jobs.get(job_id, {'state': 'unknown'})
+        
         return jsonify({'status': 'success', 'data': status_info})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -492,5 +766,9 @@ if __name__ == '__main__':
     logger.info("Open your browser and navigate to: http://localhost:5000")
     logger.info("="*70)
     
-    # Run Flask app
-    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+    # Run Flask app; each /video_feed client holds a server thread while it
+    # streams, so prefer waitress' thread pool over the development server
+    if serve is not None:
+        serve(app, host='0.0.0.0', port=5000, threads=8)
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
@@ -4,10 +4,14 @@ Processes test_video.mp4 and generates output with all features
 """
 
 import cv2
+import numpy as np
 import os
+import queue
 import sys
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configure logging
@@ -27,19 +31,45 @@ from overlays.advanced_overlay_renderer import AdvancedOverlayRenderer
 from transforms.bev_transformer import BirdEyeViewTransformer
 
 
+# Marks the end of the stream in the pipeline queues
+_SENTINEL = object()
+
+# TensorRT export of yolov8n, preferred over the PyTorch weights when present:
+#   yolo export model=yolov8n.pt format=engine half=True imgsz=640 dynamic=False batch=4
+YOLO_ENGINE = 'yolov8n.engine'
+YOLO_WEIGHTS = 'yolov8n.pt'
+
+
+def _gstreamer_available():
+    """Check whether OpenCV was built with the GStreamer backend"""
+    for line in cv2.getBuildInformation().splitlines():
+        if line.strip().startswith('GStreamer:'):
+            return 'YES' in line
+    return False
+
+
+GSTREAMER_AVAILABLE = _gstreamer_available()
+
+
 class VideoProcessor:
     """Process video with ADAS system and generate results"""
     
-    def __init__(self, video_path, output_dir='demo_output'):
+    # Bottom edge of the status panel
+    PANEL_HEIGHT = 120
+    
+    def __init__(self, video_path, output_dir='demo_output', skip_interval=1):
         """
         Initialize video processor
         
         Args:
             video_path: Path to input video
             output_dir: Directory for output files
+            skip_interval: Frames that reuse the previous results after each
+                fully processed frame (0 processes every frame)
         """
         self.video_path = video_path
         self.output_dir = output_dir
+        self.skip_interval = skip_interval
         self.config_loader = ConfigLoader()
         
         # Create output directory
@@ -47,7 +77,11 @@ class VideoProcessor:
         
         # Initialize ADAS system
         logger.info("Initializing ADAS System...")
-        self.adas = ADASSystem(yolo_model='yolov8n.pt', conf_threshold=0.5)
+        yolo_model = YOLO_ENGINE if os.path.exists(YOLO_ENGINE) else YOLO_WEIGHTS
+        logger.info(f"Object detection model: {yolo_model}")
+        self.adas = ADASSystem(yolo_model=yolo_model, conf_threshold=0.5)
+        # The engine is built for a fixed batch, so short batches get padded
+        self.static_batch = yolo_model.endswith('.engine')
         
         # Initialize enhanced components
         self.distance_estimator = DistanceEstimator()
@@ -63,6 +97,27 @@ class VideoProcessor:
         
         self.bev_transformer = BirdEyeViewTransformer(output_size=(300, 400))
         
+        # Frames buffered between the reader, compute and writer stages
+        self.prefetch = 8
+        # Frames per YOLO call
+        self.batch_size = 4
+        
+        # Warning checks and overlay drawing for one frame run here while the
+        # next frame is detected; a single worker keeps frames in order
+        self._overlay_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='overlay')
+        
+        # Results of the last fully processed frame, redrawn on skipped frames
+        self._last_outputs = None
+        
+        # Per-video settings, fixed once in process_video
+        self._frame_wh = None
+        self._bev_enabled = False
+        
+        # Black status panel blended into the top-left corner of every frame;
+        # covers the (10, 10)-(300, PANEL_HEIGHT) rectangle inclusive
+        self._panel_zeros = np.zeros((self.PANEL_HEIGHT - 9, 291, 3), dtype=np.uint8)
+        self._status_line_cache = {}
+        
         # Statistics
         self.stats = {
             'total_frames': 0,
@@ -87,7 +142,7 @@ class VideoProcessor:
         logger.info(f"Processing video: {self.video_path}")
         
         # Open video
-        cap = cv2.VideoCapture(self.video_path)
+        cap = self._open_capture()
         if not cap.isOpened():
             logger.error(f"Failed to open video: {self.video_path}")
             return False
@@ -100,62 +155,128 @@ class VideoProcessor:
         
         logger.info(f"Video properties: {width}x{height} @ {fps} FPS, {total_frames} frames")
         
+        # Constant for the whole video, so settle them before the frame loop
+        self._frame_wh = (width, height)
+        self._bev_enabled = bool(self.config_loader.get('overlays.bev.enabled'))
+        if self._bev_enabled:
+            self.bev_transformer.set_default_points(width, height)
+        
         # Setup video writer
         writer = None
         if output_video:
             output_path = os.path.join(self.output_dir, 'output_video.mp4')
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            writer = self._open_writer(output_path, fps, width, height)
             logger.info(f"Output video will be saved to: {output_path}")
         
+        # Decode and encode run in their own threads so codec work overlaps
+        # with detection; _process_frame stays on this thread, so the ADAS
+        # components need no locking
+        read_q = queue.Queue(maxsize=self.prefetch)
+        write_q = queue.Queue(maxsize=self.prefetch)
+        stop_event = threading.Event()
+        reader_thread = threading.Thread(target=self._read_frames, args=(cap, read_q, stop_event),
+                                         name='video-reader', daemon=True)
+        writer_thread = None
+        if writer:
+            writer_thread = threading.Thread(target=self._write_frames, args=(writer, write_q),
+                                             name='video-writer', daemon=True)
+            writer_thread.start()
+        reader_thread.start()
+        
         # Process frames
         frame_count = 0
         start_time = time.time()
         
+        def emit(render_future, index):
+            """Hand a rendered frame to the writer and report progress"""
+            processed_frame = render_future.result()
+            
+            # Write output
+            if writer_thread:
+                write_q.put(processed_frame)
+            
+            # Save frame if requested
+            if output_frames and index % 30 == 0:  # Every 30 frames
+                frame_path = os.path.join(self.output_dir, f'frame_{index:04d}.jpg')
+                cv2.imwrite(frame_path, processed_frame)
+            
+            # Progress
+            if index % 30 == 0 and logger.isEnabledFor(logging.INFO):
+                elapsed = time.time() - start_time
+                current_fps = index / elapsed
+                logger.info(f"Processed {index}/{total_frames} frames ({current_fps:.1f} FPS)")
+        
+        # Frame N renders on the overlay worker while frame N+1 is detected here
+        rendering = None
+        
         try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                frame_count += 1
-                self.stats['total_frames'] += 1
-                
-                # Process frame
-                frame_start = time.time()
-                processed_frame = self._process_frame(frame)
-                frame_time = time.time() - frame_start
+            pending = []
+            keyframes = []
+            end_of_stream = False
+            while not end_of_stream:
+                # Collect a batch of fully processed frames (plus the skipped
+                # ones between them), or whatever is left at the end of the video
+                frame = read_q.get()
+                if frame is _SENTINEL:
+                    end_of_stream = True
+                else:
+                    if self._is_keyframe(self.stats['total_frames'] + len(pending)):
+                        keyframes.append(frame)
+                    pending.append(frame)
+                if not pending or (len(keyframes) < self.batch_size and not end_of_stream):
+                    continue
                 
-                self.stats['processed_frames'] += 1
-                self.stats['total_time'] += frame_time
+                # One detector call for all keyframes in the batch
+                batch_detections = []
+                if keyframes:
+                    batch = keyframes
+                    if self.static_batch and len(batch) < self.batch_size:
+                        batch = keyframes + [keyframes[-1]] * (self.batch_size - len(keyframes))
+                    batch_detections = self.adas.object_detector.detect_batch(batch)[:len(keyframes)]
+                batch_detections = iter(batch_detections)
                 
-                # Write output
-                if writer:
-                    writer.write(processed_frame)
+                for frame in pending:
+                    is_keyframe = self._is_keyframe(self.stats['total_frames'])
+                    frame_count += 1
+                    self.stats['total_frames'] += 1
+                    
+                    # Perceive keyframes; skipped frames redraw the last results
+                    if is_keyframe:
+                        perception = self._perceive(frame, next(batch_detections))
+                        self.stats['processed_frames'] += 1
+                    else:
+                        perception = None
+                        self.stats['skipped_frames'] += 1
+                    
+                    future = self._overlay_pool.submit(self._render_frame, frame, perception)
+                    if rendering:
+                        emit(*rendering)
+                    rendering = (future, frame_count)
                 
-                # Save frame if requested
-                if output_frames and frame_count % 30 == 0:  # Every 30 frames
-                    frame_path = os.path.join(self.output_dir, f'frame_{frame_count:04d}.jpg')
-                    cv2.imwrite(frame_path, processed_frame)
-                
-                # Progress
-                if frame_count % 30 == 0:
-                    elapsed = time.time() - start_time
-                    current_fps = frame_count / elapsed
-                    logger.info(f"Processed {frame_count}/{total_frames} frames ({current_fps:.1f} FPS)")
+                pending = []
+                keyframes = []
+            
+            if rendering:
+                emit(*rendering)
         
         except Exception as e:
             logger.error(f"Error processing video: {e}")
             return False
         
         finally:
+            stop_event.set()
+            reader_thread.join()
+            if writer_thread:
+                # Drain everything queued so far before closing the file
+                write_q.put(_SENTINEL)
+                writer_thread.join()
             cap.release()
             if writer:
                 writer.release()
         
         # Calculate statistics
         self.stats['total_time'] = time.time() - start_time
-        self.stats['avg_fps'] = self.stats['processed_frames'] / self.stats['total_time']
+        self.stats['avg_fps'] = self.stats['total_frames'] / self.stats['total_time']
         
         logger.info(f"Video processing complete!")
         logger.info(f"Total time: {self.stats['total_time']:.2f}s")
@@ -163,31 +284,173 @@ class VideoProcessor:
         
         return True
     
-    def _process_frame(self, frame):
-        """Process single frame with all ADAS features"""
-        height, width = frame.shape[:2]
+    def _open_capture(self):
+        """
+        Open the input video, decoding H.264 on the GPU (NVDEC) when possible
+        
+        Returns:
+            cv2.VideoCapture (may be unopened if the file is unreadable)
+        """
+        if GSTREAMER_AVAILABLE:
+            pipeline = (f'filesrc location="{self.video_path}" ! qtdemux ! h264parse ! '
+                        "nvh264dec ! videoconvert ! video/x-raw,format=BGR ! appsink")
+            cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                logger.info("Decoding with GStreamer nvh264dec")
+                return cap
+            cap.release()
+            logger.info("nvh264dec pipeline unavailable, using default decoder")
+        
+        return cv2.VideoCapture(self.video_path)
+    
+    @staticmethod
+    def _open_writer(output_path, fps, width, height):
+        """
+        Open the output video, encoding H.264 on the GPU (NVENC) when possible
+        
+        Args:
+            output_path: Output file path
+            fps: Frame rate
+            width: Frame width
+            height: Frame height
+            
+        Returns:
+            cv2.VideoWriter, falling back to the mp4v software encoder
+        """
+        if GSTREAMER_AVAILABLE:
+            pipeline = ("appsrc ! videoconvert ! nvh264enc ! h264parse ! mp4mux ! "
+                        f'filesink location="{output_path}"')
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, (width, height), True)
+            if writer.isOpened():
+                logger.info("Encoding with GStreamer nvh264enc")
+                return writer
+            writer.release()
+            logger.info("nvh264enc pipeline unavailable, using mp4v")
+        
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    
+    @staticmethod
+    def _read_frames(cap, read_q, stop_event):
+        """Reader stage: decode frames into read_q, ending with _SENTINEL"""
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            item = frame if ret else _SENTINEL
+            
+            # Time out periodically so a stopped pipeline can't block us forever
+            while not stop_event.is_set():
+                try:
+                    read_q.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            
+            if not ret:
+                break
+    
+    @staticmethod
+    def _write_frames(writer, write_q):
+        """Writer stage: encode frames from write_q until _SENTINEL"""
+        while True:
+            frame = write_q.get()
+            if frame is _SENTINEL:
+                break
+            try:
+                writer.write(frame)
+            except Exception as e:
+                # Keep draining so the compute stage never blocks on a full queue
+                logger.error(f"Error writing frame: {e}")
+    
+    def _process_frame(self, frame, detections=None):
+        """
+        Process single frame with all ADAS features
+        
+        Args:
+            frame: Input frame (BGR format)
+            detections: Detections for this frame from a batched detector call;
+                detection runs here if None
+        """
+        return self._render_frame(frame, self._perceive(frame, detections))
+    
+    def _perceive(self, frame, detections=None):
+        """
+        Run object and lane detection for a frame
+        
+        Args:
+            frame: Input frame (BGR format)
+            detections: Detections from a batched detector call; detection
+                runs here if None
+            
+        Returns:
+            Tuple of (detections, left_lane, right_lane, lane_center, vehicle_offset)
+        """
+        adas = self.adas
+        lane_detector = adas.lane_detector
+        width, height = self._frame_wh
         
         # Object detection
-        detections = self.adas.object_detector.detect(frame)
+        if detections is None:
+            detections = adas.object_detector.detect(frame)
         self.stats['total_detections'] += len(detections)
         
         # Lane detection
-        left_lane, right_lane, _ = self.adas.lane_detector.detect_lanes(frame)
+        left_lane, right_lane, _ = lane_detector.detect_lanes(frame)
         
         # Calculate lane metrics
-        lane_center, vehicle_offset = self.adas.lane_detector.calculate_lane_center(
+        lane_center, vehicle_offset = lane_detector.calculate_lane_center(
             left_lane, right_lane, width, height
         )
         
-        # Enhanced FCWS with distance estimation
-        fcws_state, risky_detections = self.enhanced_fcws.check_collision_risk(detections, frame)
-        self.stats['warnings'][fcws_state] += 1
+        return detections, left_lane, right_lane, lane_center, vehicle_offset
+    
+    def _render_frame(self, frame, perception):
+        """
+        Update the warning systems and draw all overlays
+        
+        FCWS, LDWS and LKAS keep state that their draw methods read, so they
+        are only ever touched from here (the overlay worker).
         
-        # LDWS
-        ldws_state = self.adas.ldws.check_lane_departure(lane_center, vehicle_offset, width)
+        Args:
+            frame: Input frame (BGR format)
+            perception: Result of _perceive, or None on a skipped frame to redraw
+                the last results (objects move only a few pixels between
+                neighbouring frames at 30 FPS, so they still line up)
+        """
+        if perception is not None:
+            detections, left_lane, right_lane, lane_center, vehicle_offset = perception
+            adas = self.adas
+            width = self._frame_wh[0]
+            
+            # Enhanced FCWS with distance estimation
+            fcws_state, risky_detections = self.enhanced_fcws.check_collision_risk(detections, frame)
+            
+            # LDWS
+            ldws_state = adas.ldws.check_lane_departure(lane_center, vehicle_offset, width)
+            
+            # LKAS
+            adas.lkas.calculate_steering_angle(lane_center, vehicle_offset, width)
+            
+            self._last_outputs = (detections, left_lane, right_lane, lane_center, vehicle_offset,
+                                  fcws_state, risky_detections, ldws_state)
+        
+        return self._draw_outputs(frame, self._last_outputs)
+    
+    def _is_keyframe(self, index):
+        """Whether the frame at index runs the full pipeline"""
+        return index % (self.skip_interval + 1) == 0
+    
+    def _draw_outputs(self, frame, outputs):
+        """
+        Advance animations and draw all overlays for a set of results
         
-        # LKAS
-        steering_angle = self.adas.lkas.calculate_steering_angle(lane_center, vehicle_offset, width)
+        Args:
+            frame: Input frame (BGR format)
+            outputs: Tuple stored in _last_outputs by _process_frame
+        """
+        (detections, left_lane, right_lane, lane_center, vehicle_offset,
+         fcws_state, risky_detections, ldws_state) = outputs
+        adas = self.adas
+        self.stats['warnings'][fcws_state] += 1
         
         # Update animations
         self.animation_engine.update(0.033)  # ~30 FPS
@@ -195,21 +458,22 @@ class VideoProcessor:
         # Draw overlays
         frame = self.overlay_renderer.draw_lane_polygon(frame, left_lane, right_lane)
         frame = self.enhanced_fcws.draw_warning(frame, risky_detections)
-        frame = self.adas.ldws.draw_warning(frame, lane_center, vehicle_offset)
-        frame = self.adas.lkas.draw_assistance(frame, lane_center, vehicle_offset)
-        frame = self.adas.object_detector.draw_detections(frame, detections)
+        frame = adas.ldws.draw_warning(frame, lane_center, vehicle_offset)
+        frame = adas.lkas.draw_assistance(frame, lane_center, vehicle_offset)
+        frame = adas.object_detector.draw_detections(frame, detections)
         
         # Draw BEV if enabled
-        if self.config_loader.get('overlays.bev.enabled'):
+        if self._bev_enabled:
+            bev = self.bev_transformer
             try:
-                self.bev_transformer.set_default_points(width, height)
-                bev_frame = self.bev_transformer.transform_frame(frame)
+                bev_frame = bev.transform_frame(frame)
                 if bev_frame is not None:
-                    left_bev, right_bev = self.bev_transformer.transform_lanes(left_lane, right_lane)
-                    bev_frame = self.bev_transformer.draw_bev_overlay(bev_frame, left_bev, right_bev)
-                    frame = self.bev_transformer.create_pip_overlay(frame, bev_frame, position='bottom-right')
+                    left_bev, right_bev = bev.transform_lanes(left_lane, right_lane)
+                    bev_frame = bev.draw_bev_overlay(bev_frame, left_bev, right_bev)
+                    frame = bev.create_pip_overlay(frame, bev_frame, position='bottom-right')
             except Exception as e:
-                logger.debug(f"BEV rendering error: {e}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"BEV rendering error: {e}")
         
         # Draw status panel
         frame = self._draw_status_panel(frame, fcws_state, ldws_state, len(detections))
@@ -218,34 +482,21 @@ class VideoProcessor:
     
     def _draw_status_panel(self, frame, fcws_state, ldws_state, num_detections):
         """Draw status panel on frame"""
-        height, width = frame.shape[:2]
-        
-        # Draw semi-transparent panel
-        panel_height = 120
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (300, panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Draw semi-transparent panel, blending only the panel region
+        panel_height = self.PANEL_HEIGHT
+        roi = frame[10:panel_height + 1, 10:301]
+        zeros = self._panel_zeros[:roi.shape[0], :roi.shape[1]]
+        cv2.addWeighted(zeros, 0.7, roi, 0.3, 0, dst=roi)
         cv2.rectangle(frame, (10, 10), (300, panel_height), (255, 255, 255), 2)
         
         # Draw status information
         y_offset = 35
         line_height = 25
         
-        # FCWS status
-        fcws_color = (0, 255, 0) if fcws_state == "SAFE" else (0, 165, 255) if fcws_state == "WARNING" else (0, 0, 255)
-        cv2.putText(frame, f"FCWS: {fcws_state}", (20, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, fcws_color, 2)
-        
-        # LDWS status
-        ldws_color = (0, 255, 0) if ldws_state == "SAFE" else (0, 165, 255)
-        cv2.putText(frame, f"LDWS: {ldws_state}", (20, y_offset + line_height), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, ldws_color, 2)
-        
-        # LKAS status
-        lkas_color = (0, 255, 0) if self.adas.lkas.assist_active else (128, 128, 128)
-        lkas_status = "ACTIVE" if self.adas.lkas.assist_active else "STANDBY"
-        cv2.putText(frame, f"LKAS: {lkas_status}", (20, y_offset + line_height * 2), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, lkas_color, 2)
+        # FCWS, LDWS and LKAS status
+        for text, org, color in self._status_lines(fcws_state, ldws_state,
+                                                   self.adas.lkas.assist_active):
+            cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         
         # Detection count
         cv2.putText(frame, f"Objects: {num_detections}", (20, y_offset + line_height * 3), 
@@ -253,57 +504,91 @@ class VideoProcessor:
         
         return frame
     
+    def _status_lines(self, fcws_state, ldws_state, lkas_active):
+        """
+        Text, position and color of the state lines in the status panel
+        
+        The states change only on transitions, so each combination is laid
+        out once and reused.
+        
+        Returns:
+            Tuple of (text, origin, color) per line
+        """
+        key = (fcws_state, ldws_state, lkas_active)
+        lines = self._status_line_cache.get(key)
+        if lines is None:
+            y_offset = 35
+            line_height = 25
+            
+            fcws_color = (0, 255, 0) if fcws_state == "SAFE" else (0, 165, 255) if fcws_state == "WARNING" else (0, 0, 255)
+            ldws_color = (0, 255, 0) if ldws_state == "SAFE" else (0, 165, 255)
+            lkas_color = (0, 255, 0) if lkas_active else (128, 128, 128)
+            lkas_status = "ACTIVE" if lkas_active else "STANDBY"
+            
+            lines = (
+                (f"FCWS: {fcws_state}", (20, y_offset), fcws_color),
+                (f"LDWS: {ldws_state}", (20, y_offset + line_height), ldws_color),
+                (f"LKAS: {lkas_status}", (20, y_offset + line_height * 2), lkas_color),
+            )
+            self._status_line_cache[key] = lines
+        return lines
+    
     def generate_report(self):
         """Generate processing report"""
         report_path = os.path.join(self.output_dir, 'processing_report.txt')
         
+        # Build the whole report first and write it in one call
+        parts = []
+        parts.append("="*70 + "\n")
+        parts.append("ADAS ENHANCED SYSTEM - VIDEO PROCESSING REPORT\n")
+        parts.append("="*70 + "\n\n")
+        
+        parts.append(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append(f"Input Video: {self.video_path}\n")
+        parts.append(f"Output Directory: {self.output_dir}\n\n")
+        
+        parts.append("VIDEO STATISTICS\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"Total Frames: {self.stats['total_frames']}\n")
+        parts.append(f"Processed Frames: {self.stats['processed_frames']}\n")
+        parts.append(f"Skipped Frames: {self.stats['skipped_frames']}\n")
+        parts.append(f"Frame Skip Interval: {self.skip_interval}\n")
+        parts.append(f"Total Processing Time: {self.stats['total_time']:.2f} seconds\n")
+        parts.append(f"Average FPS: {self.stats['avg_fps']:.2f}\n\n")
+        
+        parts.append("DETECTION STATISTICS\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"Total Detections: {self.stats['total_detections']}\n")
+        parts.append(f"Average Detections per Frame: {self.stats['total_detections'] / max(self.stats['processed_frames'], 1):.2f}\n\n")
+        
+        parts.append("WARNING STATISTICS\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"SAFE Frames: {self.stats['warnings']['SAFE']}\n")
+        parts.append(f"WARNING Frames: {self.stats['warnings']['WARNING']}\n")
+        parts.append(f"CRITICAL Frames: {self.stats['warnings']['CRITICAL']}\n\n")
+        
+        parts.append("SYSTEM CONFIGURATION\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"Lane Detection Model: DL + CV Fallback\n")
+        parts.append(f"Object Detection Model: YOLOv8n\n")
+        parts.append(f"Distance Estimation: Uncalibrated (Normalized)\n")
+        parts.append(f"Overlay Rendering: Advanced with Animations\n")
+        parts.append(f"BEV Transformation: Enabled\n\n")
+        
+        parts.append("FEATURES ENABLED\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"[OK] Forward Collision Warning System (FCWS)\n")
+        parts.append(f"[OK] Lane Departure Warning System (LDWS)\n")
+        parts.append(f"[OK] Lane Keeping Assistance System (LKAS)\n")
+        parts.append(f"[OK] Enhanced Distance Estimation\n")
+        parts.append(f"[OK] Advanced Overlay Rendering\n")
+        parts.append(f"[OK] Animation Engine\n")
+        parts.append(f"[OK] Bird's Eye View Transformation\n\n")
+        
+        parts.append("="*70 + "\n")
+        
         with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("="*70 + "\n")
-            f.write("ADAS ENHANCED SYSTEM - VIDEO PROCESSING REPORT\n")
-            f.write("="*70 + "\n\n")
-            
-            f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Input Video: {self.video_path}\n")
-            f.write(f"Output Directory: {self.output_dir}\n\n")
-            
-            f.write("VIDEO STATISTICS\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"Total Frames: {self.stats['total_frames']}\n")
-            f.write(f"Processed Frames: {self.stats['processed_frames']}\n")
-            f.write(f"Skipped Frames: {self.stats['skipped_frames']}\n")
-            f.write(f"Total Processing Time: {self.stats['total_time']:.2f} seconds\n")
-            f.write(f"Average FPS: {self.stats['avg_fps']:.2f}\n\n")
-            
-            f.write("DETECTION STATISTICS\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"Total Detections: {self.stats['total_detections']}\n")
-            f.write(f"Average Detections per Frame: {self.stats['total_detections'] / max(self.stats['processed_frames'], 1):.2f}\n\n")
-            
-            f.write("WARNING STATISTICS\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"SAFE Frames: {self.stats['warnings']['SAFE']}\n")
-            f.write(f"WARNING Frames: {self.stats['warnings']['WARNING']}\n")
-            f.write(f"CRITICAL Frames: {self.stats['warnings']['CRITICAL']}\n\n")
-            
-            f.write("SYSTEM CONFIGURATION\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"Lane Detection Model: DL + CV Fallback\n")
-            f.write(f"Object Detection Model: YOLOv8n\n")
-            f.write(f"Distance Estimation: Uncalibrated (Normalized)\n")
-            f.write(f"Overlay Rendering: Advanced with Animations\n")
-            f.write(f"BEV Transformation: Enabled\n\n")
-            
-            f.write("FEATURES ENABLED\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"[OK] Forward Collision Warning System (FCWS)\n")
-            f.write(f"[OK] Lane Departure Warning System (LDWS)\n")
-            f.write(f"[OK] Lane Keeping Assistance System (LKAS)\n")
-            f.write(f"[OK] Enhanced Distance Estimation\n")
-            f.write(f"[OK] Advanced Overlay Rendering\n")
-            f.write(f"[OK] Animation Engine\n")
-            f.write(f"[OK] Bird's Eye View Transformation\n\n")
-            
-            f.write("="*70 + "\n")
+            f.write("".join(parts))
         
         logger.info(f"Report saved to: {report_path}")
         return report_path
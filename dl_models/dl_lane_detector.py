@@ -4,6 +4,7 @@ Provides interface for DL-based lane detection with preprocessing and postproces
 """
 
 import cv2
+import math
 import numpy as np
 import time
 import logging
@@ -11,6 +12,7 @@ from typing import Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 
 from .lane_detection_result import LaneDetectionResult
+from . import lane_numba
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +37,15 @@ class DLLaneDetector(ABC):
         self.device = device
         self.conf_threshold = conf_threshold
         self.input_size = input_size
+        # Tensor layout the model expects: 'nchw' or 'nhwc'
+        self.input_layout = 'nchw'
         self.model = None
         self.is_loaded = False
         
+        # Reused resize and colour conversion targets for preprocess_frame
+        self._resize_buf = np.empty((input_size[0], input_size[1], 3), dtype=np.uint8)
+        self._rgb_buf = np.empty_like(self._resize_buf)
+        
         logger.info(f"Initializing DL Lane Detector: {model_type} on {device}")
     
     @abstractmethod
@@ -50,32 +58,40 @@ class DLLaneDetector(ABC):
         """
         pass
     
-    def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
+    def preprocess_frame(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Preprocess frame for model input
         
         Args:
             frame: Input frame (BGR format)
+            out: Optional float32 tensor of the model input shape to write into
             
         Returns:
-            Preprocessed tensor/array ready for model
-        """
-        # Resize to model input size
-        resized = cv2.resize(frame, (self.input_size[1], self.input_size[0]))
-        
-        # Convert BGR to RGB
-        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-        
-        # Normalize to [0, 1]
-        normalized = rgb.astype(np.float32) / 255.0
-        
-        # Transpose to CHW format (channels first)
-        transposed = np.transpose(normalized, (2, 0, 1))
-        
-        # Add batch dimension
-        batched = np.expand_dims(transposed, axis=0)
-        
-        return batched
+            Preprocessed tensor/array ready for model (out when given)
+        """
+        size = (self.input_size[1], self.input_size[0])
+        scale = np.float32(1.0 / 255.0)
+        
+        # Resize to model input size into the reused buffer
+        cv2.resize(frame, size, dst=self._resize_buf, interpolation=cv2.INTER_LINEAR)
+        
+        if self.input_layout == 'nhwc':
+            # Already HWC after the resize: no transpose, just RGB and [0, 1] scaling
+            rgb = cv2.cvtColor(self._resize_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            if out is None:
+                out = np.empty((1,) + rgb.shape, dtype=np.float32)
+            np.multiply(rgb, scale, out=out[0], dtype=np.float32)
+            return out
+        
+        if out is not None:
+            # Scale each BGR plane straight into its RGB channel of out
+            for c in range(3):
+                np.multiply(self._resize_buf[:, :, 2 - c], scale, out=out[0, c], dtype=np.float32)
+            return out
+        
+        # BGR->RGB, [0, 1] scaling, CHW transpose and batch dimension in one pass
+        return cv2.dnn.blobFromImage(self._resize_buf, scalefactor=1.0 / 255.0, size=size,
+                                     swapRB=True, crop=False)
     
     @abstractmethod
     def detect_lanes(self, frame: np.ndarray) -> LaneDetectionResult:
@@ -118,20 +134,24 @@ class DLLaneDetector(ABC):
         if lane_points is None or len(lane_points) < degree + 1:
             return None
         
-        try:
-            # Extract x and y coordinates
-            if lane_points.ndim == 2 and lane_points.shape[1] == 2:
-                x = lane_points[:, 0]
-                y = lane_points[:, 1]
-            else:
+        # Extract x and y coordinates
+        if lane_points.ndim == 2 and lane_points.shape[1] == 2:
+            x = lane_points[:, 0]
+            y = lane_points[:, 1]
+        else:
+            return None
+        
+        # Fit polynomial (y as function of x)
+        if degree == 2:
+            coeffs = lane_numba.fit_quadratic(y, x)
+            if not np.all(np.isfinite(coeffs)):
                 return None
-            
-            # Fit polynomial (y as function of x)
-            coeffs = np.polyfit(y, x, degree)
-            
             return coeffs
         
-        except Exception as e:
+        # Only the SVD inside np.polyfit can fail
+        try:
+            return np.polyfit(y, x, degree)
+        except np.linalg.LinAlgError as e:
             logger.warning(f"Error fitting polynomial: {e}")
             return None
     
@@ -149,21 +169,16 @@ class DLLaneDetector(ABC):
         if poly_coeffs is None or len(poly_coeffs) < 3:
             return float('inf')
         
-        try:
-            # For polynomial x = a*y^2 + b*y + c
-            # Curvature = ((1 + (dx/dy)^2)^(3/2)) / |d2x/dy2|
-            a, b = poly_coeffs[0], poly_coeffs[1]
-            
-            dx_dy = 2 * a * y_eval + b
-            d2x_dy2 = 2 * a
-            
-            curvature = ((1 + dx_dy**2)**1.5) / abs(d2x_dy2)
-            
-            return curvature
-        
-        except Exception as e:
-            logger.warning(f"Error calculating curvature: {e}")
+        # For polynomial x = a*y^2 + b*y + c
+        # Curvature = ((1 + (dx/dy)^2)^(3/2)) / |d2x/dy2|
+        # Plain float math: a single evaluation is cheaper than a kernel call
+        d2x_dy2 = 2.0 * float(poly_coeffs[0])
+        if d2x_dy2 == 0.0:
             return float('inf')
+        dx_dy = d2x_dy2 * float(y_eval) + float(poly_coeffs[1])
+        # v^1.5 as v * sqrt(v): a multiply and a sqrt instead of pow
+        v = 1.0 + dx_dy * dx_dy
+        return v * math.sqrt(v) / abs(d2x_dy2)
     
     def scale_lanes_to_original(self, lanes: Dict[str, Any], 
                                 original_shape: Tuple[int, int]) -> Dict[str, Any]:
@@ -180,24 +195,19 @@ class DLLaneDetector(ABC):
         scale_x = original_shape[1] / self.input_size[1]
         scale_y = original_shape[0] / self.input_size[0]
         
+        # One broadcast multiply per entry; the product is already a new array
+        scale4 = np.array([scale_x, scale_y, scale_x, scale_y])
+        
         scaled_lanes = {}
         
         for key, value in lanes.items():
             if value is not None and isinstance(value, np.ndarray):
                 if value.ndim == 2 and value.shape[1] == 2:
                     # Scale point coordinates
-                    scaled_value = value.copy()
-                    scaled_value[:, 0] *= scale_x
-                    scaled_value[:, 1] *= scale_y
-                    scaled_lanes[key] = scaled_value
+                    scaled_lanes[key] = self.scale_points_to_original(value, original_shape)
                 elif value.ndim == 1 and len(value) == 4:
                     # Scale line coordinates [x1, y1, x2, y2]
-                    scaled_value = value.copy()
-                    scaled_value[0] *= scale_x
-                    scaled_value[1] *= scale_y
-                    scaled_value[2] *= scale_x
-                    scaled_value[3] *= scale_y
-                    scaled_lanes[key] = scaled_value
+                    scaled_lanes[key] = (value * scale4).astype(value.dtype, copy=False)
                 else:
                     scaled_lanes[key] = value
             else:
@@ -205,6 +215,25 @@ class DLLaneDetector(ABC):
         
         return scaled_lanes
     
+    def scale_points_to_original(self, points: np.ndarray,
+                                 original_shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Scale Nx2 [x, y] points from model input size to original frame size
+        
+        Args:
+            points: Lane points in model input coordinates
+            original_shape: Original frame shape (height, width)
+            
+        Returns:
+            New array of scaled points with the dtype of points
+        """
+        scale = np.array([original_shape[1] / self.input_size[1],
+                          original_shape[0] / self.input_size[0]])
+        if points.dtype.kind == 'f':
+            # Multiply in the points' own precision, no upcast and cast back
+            return points * scale.astype(points.dtype)
+        return (points * scale).astype(points.dtype)
+    
     def is_model_loaded(self) -> bool:
         """Check if model is loaded"""
         return self.is_loaded
@@ -3,13 +3,16 @@ Hybrid Lane Detector with DL and CV Fallback
 Automatically falls back to CV detection when DL confidence is low
 """
 
+import cv2
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 import numpy as np
 
 from .dl_lane_detector import DLLaneDetector
 from .lane_detection_result import LaneDetectionResult
+from . import lane_numba
 from lane_detector import LaneDetector
 
 logger = logging.getLogger(__name__)
@@ -22,7 +25,8 @@ class HybridLaneDetector:
     
     def __init__(self, dl_detector: Optional[DLLaneDetector], 
                  conf_threshold: float = 0.6,
-                 max_consecutive_failures: int = 5):
+                 max_consecutive_failures: int = 5,
+                 use_opencl: bool = False):
         """
         Initialize Hybrid Lane Detector
         
@@ -30,9 +34,10 @@ class HybridLaneDetector:
             dl_detector: Deep learning lane detector (can be None)
             conf_threshold: Confidence threshold for using DL results
             max_consecutive_failures: Max consecutive DL failures before disabling
+            use_opencl: Run the CV fallback's preprocessing through OpenCL (UMat)
         """
         self.dl_detector = dl_detector
-        self.cv_detector = LaneDetector()  # Traditional CV detector
+        self.cv_detector = LaneDetector(use_opencl=use_opencl)  # Traditional CV detector
         self.conf_threshold = conf_threshold
         self.max_consecutive_failures = max_consecutive_failures
         
@@ -42,6 +47,25 @@ class HybridLaneDetector:
         self.dl_success_count = 0
         self.cv_fallback_count = 0
         
+        # Run the DL model only on every keyframe_interval-th frame and track
+        # its last lanes with a narrow Hough search in between
+        self.keyframe_interval = 3
+        self.track_margin = 20
+        self.frame_idx = 0
+        self.tracked_count = 0
+        self._last_left_lane = None
+        self._last_right_lane = None
+        
+        # The DL model runs on a worker thread; each keyframe uses the newest
+        # finished result and submits the current frame if the worker is idle
+        self._dl_pool = (ThreadPoolExecutor(max_workers=1, thread_name_prefix='dl-lane')
+                         if dl_detector is not None else None)
+        self._dl_future = None
+        
+        # DL lanes are written into these instead of a new array per frame
+        self._line_buf_left = np.empty(4, dtype=np.int32)
+        self._line_buf_right = np.empty(4, dtype=np.int32)
+        
         logger.info(f"Hybrid Lane Detector initialized")
         logger.info(f"DL enabled: {self.dl_enabled}, Confidence threshold: {self.conf_threshold}")
     
@@ -58,32 +82,42 @@ class HybridLaneDetector:
         left_lane = None
         right_lane = None
         used_dl = False
+        is_keyframe = self.frame_idx % self.keyframe_interval == 0
+        self.frame_idx += 1
+        
+        # Between keyframes, follow the last DL lanes instead of re-running the model
+        if (self.dl_enabled and not is_keyframe and
+                (self._last_left_lane is not None or self._last_right_lane is not None)):
+            left_lane, right_lane = self._track_lanes(frame)
+            self.tracked_count += 1
+            return left_lane, right_lane, frame
         
         # Try DL detection first if enabled
         if self.dl_enabled and self.consecutive_failures < self.max_consecutive_failures:
-            try:
-                result = self.dl_detector.detect_lanes(frame)
-                
-                # Check if DL detection was successful and confident
-                if result.success and result.confidence >= self.conf_threshold:
-                    # Use DL results
-                    left_lane, right_lane = self._convert_dl_result_to_lines(result, frame.shape)
-                    
-                    if left_lane is not None or right_lane is not None:
-                        used_dl = True
-                        self.consecutive_failures = 0
-                        self.dl_success_count += 1
-                        logger.debug(f"DL detection successful (confidence: {result.confidence:.2f})")
-                    else:
-                        logger.debug("DL detection returned no valid lanes")
-                        self.consecutive_failures += 1
-                else:
-                    logger.debug(f"DL confidence too low: {result.confidence:.2f} < {self.conf_threshold}")
-                    self.consecutive_failures += 1
+            result, is_new = self._poll_dl_result(frame)
             
-            except Exception as e:
-                logger.warning(f"DL detection error: {e}")
-                self.consecutive_failures += 1
+            # No inference finished since the last keyframe: keep following
+            # the current lanes rather than snapping back to an old result
+            if not is_new and (self._last_left_lane is not None or
+                               self._last_right_lane is not None):
+                left_lane, right_lane = self._track_lanes(frame)
+                self.tracked_count += 1
+                return left_lane, right_lane, frame
+            
+            self._last_left_lane = None
+            self._last_right_lane = None
+            if result is not None:
+                # Use DL results
+                left_lane, right_lane = self._convert_dl_result_to_lines(result, frame.shape)
+                
+                if left_lane is not None or right_lane is not None:
+                    used_dl = True
+                    self.dl_success_count += 1
+                    self._last_left_lane = left_lane
+                    self._last_right_lane = right_lane
+        else:
+            self._last_left_lane = None
+            self._last_right_lane = None
         
         # Fallback to CV if DL failed or not used
         if not used_dl:
@@ -101,6 +135,113 @@ class HybridLaneDetector:
         
         return left_lane, right_lane, frame
     
+    def _poll_dl_result(self, frame: np.ndarray) -> Tuple[Optional[LaneDetectionResult], bool]:
+        """
+        Collect a finished DL inference and start the next one if the worker is idle
+        
+        Args:
+            frame: Current frame, copied for the worker
+            
+        Returns:
+            Tuple of (result, is_new): is_new is True when an inference
+            finished since the last poll, and result is its confident
+            result (None if it failed or was not confident)
+        """
+        result = None
+        is_new = False
+        if self._dl_future is not None and self._dl_future.done():
+            result = self._evaluate_dl_result(self._dl_future)
+            is_new = True
+            self._dl_future = None
+        
+        if self._dl_future is None:
+            self._dl_future = self._dl_pool.submit(self.dl_detector.detect_lanes, frame.copy())
+        
+        return result, is_new
+    
+    def _evaluate_dl_result(self, future) -> Optional[LaneDetectionResult]:
+        """Check a finished DL inference and update the failure counter"""
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"DL detection error: {e}")
+            self.consecutive_failures += 1
+            return None
+        
+        # Check if DL detection was successful and confident
+        if not (result.success and result.confidence >= self.conf_threshold):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"DL confidence too low: {result.confidence:.2f} < {self.conf_threshold}")
+            self.consecutive_failures += 1
+            return None
+        
+        if result.left_lane is None and result.right_lane is None:
+            logger.debug("DL detection returned no valid lanes")
+            self.consecutive_failures += 1
+            return None
+        
+        self.consecutive_failures = 0
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"DL detection successful (confidence: {result.confidence:.2f})")
+        return result
+    
+    def _track_lanes(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Refine the last DL lanes with Hough segments found near them
+        
+        Args:
+            frame: Input frame (BGR format)
+            
+        Returns:
+            Tuple of (left_lane, right_lane) in [x1, y1, x2, y2] format
+        """
+        height = frame.shape[0]
+        top = int(height * 0.6)
+        
+        # Lanes only span the lower part of the frame
+        gray = cv2.cvtColor(frame[top:], cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 50, 150)
+        
+        self._last_left_lane = self._refine_lane(self._last_left_lane, edges, top)
+        self._last_right_lane = self._refine_lane(self._last_right_lane, edges, top)
+        return self._last_left_lane, self._last_right_lane
+    
+    def _refine_lane(self, lane: Optional[np.ndarray], edges: np.ndarray,
+                     top: int) -> Optional[np.ndarray]:
+        """
+        Re-fit a lane line to edge segments within track_margin pixels of it
+        
+        Args:
+            lane: Previous lane [x1, y1, x2, y2] in frame coordinates
+            edges: Edge image of the frame below row top
+            top: Row offset of the edge image
+            
+        Returns:
+            Refined lane, or the previous lane if no supporting segments were found
+        """
+        if lane is None:
+            return None
+        
+        x1, y1, x2, y2 = (int(v) for v in lane)
+        mask = np.zeros_like(edges)
+        cv2.line(mask, (x1, y1 - top), (x2, y2 - top), 255, thickness=2 * self.track_margin)
+        
+        segments = cv2.HoughLinesP(cv2.bitwise_and(edges, mask), rho=1, theta=np.pi/180,
+                                   threshold=20, minLineLength=20, maxLineGap=50)
+        if segments is None:
+            return lane
+        
+        points = segments.reshape(-1, 2).astype(np.float64)
+        ys = points[:, 1] + top
+        if np.ptp(ys) == 0:
+            return lane
+        
+        # x as a linear function of y, extrapolated to the previous lane's rows
+        slope, intercept = lane_numba.polyfit_linear(ys, np.ascontiguousarray(points[:, 0]))
+        if not (np.isfinite(slope) and np.isfinite(intercept)):
+            return lane
+        return np.array([int(slope * y1 + intercept), y1, int(slope * y2 + intercept), y2])
+    
     def _convert_dl_result_to_lines(self, result: LaneDetectionResult, 
                                     frame_shape: Tuple[int, int, int]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """
@@ -111,7 +252,8 @@ class HybridLaneDetector:
             frame_shape: Frame shape (height, width, channels)
             
         Returns:
-            Tuple of (left_lane, right_lane) in [x1, y1, x2, y2] format
+            Tuple of (left_lane, right_lane) in [x1, y1, x2, y2] format; the
+            arrays are reused on the next conversion, so copy them to keep them
         """
         height, width = frame_shape[:2]
         
@@ -120,73 +262,84 @@ class HybridLaneDetector:
         
         # Convert left lane
         if result.left_lane is not None:
-            left_lane = self._points_to_line(result.left_lane, height)
+            left_lane = self._points_to_line(result.left_lane, height, self._line_buf_left)
         
         # Convert right lane
         if result.right_lane is not None:
-            right_lane = self._points_to_line(result.right_lane, height)
+            right_lane = self._points_to_line(result.right_lane, height, self._line_buf_right)
         
         return left_lane, right_lane
     
-    def _points_to_line(self, points: np.ndarray, frame_height: int) -> Optional[np.ndarray]:
+    def _points_to_line(self, points: np.ndarray, frame_height: int,
+                        out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Convert lane points to line format [x1, y1, x2, y2]
         
         Args:
             points: Lane points (Nx2 or polynomial coefficients)
             frame_height: Frame height
+            out: Optional (4,) int32 array to write the line into
             
         Returns:
-            Line coordinates or None
+            Line coordinates (out when given) or None
         """
         if points is None:
             return None
         
-        try:
-            # Check if points are polynomial coefficients
-            if points.ndim == 1 and len(points) <= 3:
-                # Polynomial coefficients
-                y1 = frame_height
-                y2 = int(frame_height * 0.6)
-                
-                x1 = int(np.polyval(points, y1))
-                x2 = int(np.polyval(points, y2))
-                
-                return np.array([x1, y1, x2, y2])
+        # Check if points are polynomial coefficients
+        if points.ndim == 1 and len(points) <= 3:
+            # Polynomial coefficients
+            y1 = frame_height
+            y2 = int(frame_height * 0.6)
             
-            # Check if already in line format
-            elif points.ndim == 1 and len(points) == 4:
-                return points
+            # Inline Horner on scalars, padding lower degrees with zeros
+            a, b, c = (0.0,) * (3 - len(points)) + tuple(points.tolist())
+            x1 = int((a * y1 + b) * y1 + c)
+            x2 = int((a * y2 + b) * y2 + c)
             
-            # Points array - fit polynomial
-            elif points.ndim == 2 and points.shape[1] == 2:
-                # Fit polynomial to points
-                if len(points) < 2:
-                    return None
-                
-                x = points[:, 0]
-                y = points[:, 1]
-                
-                # Fit 2nd degree polynomial
-                try:
-                    coeffs = np.polyfit(y, x, 2)
-                except:
-                    # Fallback to linear
-                    coeffs = np.polyfit(y, x, 1)
-                
-                y1 = frame_height
-                y2 = int(frame_height * 0.6)
-                
-                x1 = int(np.polyval(coeffs, y1))
-                x2 = int(np.polyval(coeffs, y2))
-                
-                return np.array([x1, y1, x2, y2])
+            return self._fill_line(out, x1, y1, x2, y2)
         
-        except Exception as e:
-            logger.warning(f"Error converting points to line: {e}")
+        # Check if already in line format
+        elif points.ndim == 1 and len(points) == 4:
+            return points
+        
+        # Points array - fit polynomial
+        elif points.ndim == 2 and points.shape[1] == 2:
+            # Fit polynomial to points
+            if len(points) < 2:
+                return None
+            
+            x = points[:, 0]
+            y = points[:, 1]
+            
+            # Closed-form 2nd degree fit (linear when the points can't
+            # support a quadratic)
+            coeffs = lane_numba.fit_quadratic(y, x)
+            if not np.isfinite(coeffs[2]):
+                return None
+            
+            y1 = frame_height
+            y2 = int(frame_height * 0.6)
+            
+            a, b, c = coeffs.tolist()
+            x1 = int((a * y1 + b) * y1 + c)
+            x2 = int((a * y2 + b) * y2 + c)
+            
+            return self._fill_line(out, x1, y1, x2, y2)
         
         return None
     
+    @staticmethod
+    def _fill_line(out: Optional[np.ndarray], x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+        """Write [x1, y1, x2, y2] into out, allocating it if None"""
+        if out is None:
+            out = np.empty(4, dtype=np.int32)
+        out[0] = x1
+        out[1] = y1
+        out[2] = x2
+        out[3] = y2
+        return out
+    
     def get_statistics(self) -> dict:
         """Get detection statistics"""
         total = self.dl_success_count + self.cv_fallback_count
@@ -195,6 +348,7 @@ class HybridLaneDetector:
             'dl_success_count': self.dl_success_count,
             'cv_fallback_count': self.cv_fallback_count,
             'total_detections': total,
+            'tracked_count': self.tracked_count,
             'dl_success_rate': self.dl_success_count / total if total > 0 else 0.0,
             'consecutive_failures': self.consecutive_failures,
             'dl_enabled': self.dl_enabled
@@ -205,6 +359,21 @@ class HybridLaneDetector:
         self.dl_success_count = 0
         self.cv_fallback_count = 0
         self.consecutive_failures = 0
+        self.tracked_count = 0
+        self.frame_idx = 0
+        self._last_left_lane = None
+        self._last_right_lane = None
+        # A result still in flight belongs to the old run
+        if self._dl_future is not None:
+            self._dl_future.cancel()
+            self._dl_future = None
+    
+    def shutdown(self):
+        """Stop the DL worker thread"""
+        if self._dl_pool is not None:
+            self._dl_pool.shutdown(wait=True)
+            self._dl_pool = None
+            self._dl_future = None
     
     def enable_dl(self):
         """Re-enable DL detection"""
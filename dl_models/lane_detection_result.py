@@ -2,12 +2,17 @@
 Data classes for lane detection results
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 import numpy as np
 
+# One result is created per frame; slots drop the per-instance __dict__
+# where the dataclass option exists (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class LaneDetectionResult:
     """Result from lane detection model"""
     left_lane: Optional[np.ndarray]  # Polynomial coefficients or point array
@@ -20,5 +25,5 @@ class LaneDetectionResult:
     
     def __post_init__(self):
         """Validate data after initialization"""
-        if self.confidence < 0.0 or self.confidence > 1.0:
+        if not 0.0 <= self.confidence <= 1.0:
             raise ValueError(f"Confidence must be between 0 and 1, got {self.confidence}")
@@ -0,0 +1,388 @@
+"""
+Numba-compiled lane geometry kernels
+Small-array polynomial math used per frame by the lane detectors.
+Falls back to plain Python/NumPy when numba is not installed.
+"""
+
+import logging
+import math
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def polyfit_quadratic(y, x):
+    """
+    Least-squares fit of x = a*y^2 + b*y + c
+    
+    Solves the 3x3 normal equations with Cramer's rule on centered and
+    scaled y values to keep them well conditioned for pixel coordinates.
+    Points with a NaN or inf coordinate are skipped.
+    
+    Args:
+        y: float64 array of y coordinates
+        x: float64 array of x coordinates
+    
+    Returns:
+        Coefficients [a, b, c] (highest power first, like np.polyfit);
+        all NaN if the system is singular
+    """
+    result = np.full(3, np.nan)
+    
+    n = 0
+    mean = 0.0
+    for i in range(y.shape[0]):
+        if np.isfinite(x[i]) and np.isfinite(y[i]):
+            n += 1
+            mean += y[i]
+    if n < 3:
+        return result
+    mean /= n
+    scale = 0.0
+    for i in range(y.shape[0]):
+        if np.isfinite(x[i]) and np.isfinite(y[i]):
+            scale = max(scale, abs(y[i] - mean))
+    if scale == 0.0:
+        return result
+    
+    # Power sums of t = (y - mean) / scale
+    s1 = s2 = s3 = s4 = 0.0
+    t0 = t1 = t2 = 0.0
+    for i in range(y.shape[0]):
+        if not (np.isfinite(x[i]) and np.isfinite(y[i])):
+            continue
+        t = (y[i] - mean) / scale
+        tt = t * t
+        s1 += t
+        s2 += tt
+        s3 += tt * t
+        s4 += tt * tt
+        t0 += x[i]
+        t1 += x[i] * t
+        t2 += x[i] * tt
+    s0 = float(n)
+    
+    # | s4 s3 s2 | |a|   |t2|
+    # | s3 s2 s1 | |b| = |t1|
+    # | s2 s1 s0 | |c|   |t0|
+    det = (s4 * (s2 * s0 - s1 * s1)
+           - s3 * (s3 * s0 - s1 * s2)
+           + s2 * (s3 * s1 - s2 * s2))
+    if abs(det) < 1e-12:
+        return result
+    
+    a = (t2 * (s2 * s0 - s1 * s1)
+         - s3 * (t1 * s0 - s1 * t0)
+         + s2 * (t1 * s1 - s2 * t0)) / det
+    b = (s4 * (t1 * s0 - s1 * t0)
+         - t2 * (s3 * s0 - s1 * s2)
+         + s2 * (s3 * t0 - t1 * s2)) / det
+    c = (s4 * (s2 * t0 - t1 * s1)
+         - s3 * (s3 * t0 - t1 * s2)
+         + t2 * (s3 * s1 - s2 * s2)) / det
+    
+    # Undo the substitution t = (y - mean) / scale
+    inv = 1.0 / scale
+    result[0] = a * inv * inv
+    result[1] = b * inv - 2.0 * a * mean * inv * inv
+    result[2] = a * mean * mean * inv * inv - b * mean * inv + c
+    return result
+
+
+@njit(cache=True)
+def polyfit_linear(y, x):
+    """
+    Least-squares fit of x = b*y + c
+    
+    Points with a NaN or inf coordinate are skipped.
+    
+    Args:
+        y: float64 array of y coordinates
+        x: float64 array of x coordinates
+    
+    Returns:
+        Coefficients [b, c]; all NaN if all y are equal
+    """
+    result = np.full(2, np.nan)
+    
+    n = 0
+    sy = sx = syy = sxy = 0.0
+    for i in range(y.shape[0]):
+        if not (np.isfinite(x[i]) and np.isfinite(y[i])):
+            continue
+        n += 1
+        sy += y[i]
+        sx += x[i]
+        syy += y[i] * y[i]
+        sxy += x[i] * y[i]
+    if n < 2:
+        return result
+    
+    det = n * syy - sy * sy
+    if abs(det) < 1e-12 * max(1.0, syy):
+        return result
+    
+    result[0] = (n * sxy - sy * sx) / det
+    result[1] = (sx - result[0] * sy) / n
+    return result
+
+
+@njit(cache=True)
+def curvature_radius(a, b, y_eval):
+    """
+    Radius of curvature of x = a*y^2 + b*y + c at y_eval
+    
+    Near-straight fits (|2a| < 1e-6) count as lines.
+    """
+    d2x_dy2 = 2.0 * a
+    if abs(d2x_dy2) < 1e-6:
+        return np.inf
+    dx_dy = d2x_dy2 * y_eval + b
+    # v^1.5 as v * sqrt(v): a multiply and a sqrt instead of pow
+    v = 1.0 + dx_dy * dx_dy
+    return v * math.sqrt(v) / abs(d2x_dy2)
+
+
+@njit(cache=True)
+def horner(coeffs, y):
+    """Evaluate a polynomial of any degree (highest power first) at y"""
+    result = 0.0
+    for i in range(coeffs.shape[0]):
+        result = result * y + coeffs[i]
+    return result
+
+
+@njit(cache=True)
+def polyval_into(coeffs, y, out):
+    """Evaluate a polynomial at every y, writing the x values into out"""
+    for i in range(y.shape[0]):
+        result = 0.0
+        for k in range(coeffs.shape[0]):
+            result = result * y[i] + coeffs[k]
+        out[i] = result
+    return out
+
+
+@njit(cache=True)
+def lane_points_into(coeffs, y_start, y_end, out):
+    """
+    Fill out with [x, y] lane points for evenly spaced y from y_start to y_end
+    
+    Spaces y exactly like np.linspace, computing both columns in one pass.
+    
+    Args:
+        coeffs: float64 polynomial coefficients (highest power first)
+        y_start: First y value
+        y_end: Last y value
+        out: (N, 2) float64 array
+    
+    Returns:
+        out
+    """
+    n = out.shape[0]
+    step = (y_end - y_start) / (n - 1) if n > 1 else 0.0
+    for i in range(n):
+        y = i * step + y_start
+        if i == n - 1 and n > 1:
+            y = y_end
+        x = 0.0
+        for k in range(coeffs.shape[0]):
+            x = x * y + coeffs[k]
+        out[i, 0] = x
+        out[i, 1] = y
+    return out
+
+
+@njit(cache=True)
+def eval_two_polys(coeffs_l, coeffs_r, y, out):
+    """
+    Evaluate the left and right lane polynomials in one pass over y
+    
+    Args:
+        coeffs_l: float64 left lane coefficients (highest power first)
+        coeffs_r: float64 right lane coefficients (highest power first)
+        y: float64 y values
+        out: (N, 2, 2) array; out[i, 0] is the left [x, y] point, out[i, 1] the right
+    
+    Returns:
+        out
+    """
+    for i in range(y.shape[0]):
+        yi = y[i]
+        xl = 0.0
+        for k in range(coeffs_l.shape[0]):
+            xl = xl * yi + coeffs_l[k]
+        xr = 0.0
+        for k in range(coeffs_r.shape[0]):
+            xr = xr * yi + coeffs_r[k]
+        out[i, 0, 0] = xl
+        out[i, 0, 1] = yi
+        out[i, 1, 0] = xr
+        out[i, 1, 1] = yi
+    return out
+
+
+@njit(cache=True)
+def lane_in_bounds(coeffs, frame_width, frame_height, min_curvature):
+    """
+    Check that a lane polynomial stays near the frame and isn't too sharp
+    
+    Args:
+        coeffs: float64 polynomial coefficients (highest power first)
+        frame_width: Frame width
+        frame_height: Frame height
+        min_curvature: Smallest allowed radius at 80% of the frame height
+    
+    Returns:
+        True if the lane is plausible
+    """
+    margin = frame_width * 0.2
+    
+    # Bottom and 60% height x values in one Horner pass over the coefficients
+    y_bottom = frame_height
+    y_top = frame_height * 0.6
+    x_bottom = 0.0
+    x_top = 0.0
+    for k in range(coeffs.shape[0]):
+        x_bottom = x_bottom * y_bottom + coeffs[k]
+        x_top = x_top * y_top + coeffs[k]
+    
+    # Curvature radius at 80% height, as curvature_radius, compared without
+    # the division: radius < min  <=>  (1 + x'^2)^1.5 < min * |x''|
+    too_sharp = False
+    if coeffs.shape[0] >= 3:
+        d2x_dy2 = abs(2.0 * coeffs[0])
+        dx_dy = 2.0 * coeffs[0] * (frame_height * 0.8) + coeffs[1]
+        v = 1.0 + dx_dy * dx_dy
+        too_sharp = (d2x_dy2 >= 1e-6) & (v * math.sqrt(v) < min_curvature * d2x_dy2)
+    
+    # Every check feeds one bitmask, so lanes hovering at the frame edge
+    # don't cost a mispredicted branch per check
+    upper = frame_width + margin
+    bad = (int(x_bottom < -margin)
+           | (int(x_bottom > upper) << 1)
+           | (int(x_top < -margin) << 2)
+           | (int(x_top > upper) << 3)
+           | (int(too_sharp) << 4))
+    return bad == 0
+
+
+@njit(cache=True, fastmath=True)
+def scale_points(points, scale_x, scale_y):
+    """Return a copy of Nx2 points with x and y scaled"""
+    out = np.empty_like(points)
+    for i in range(points.shape[0]):
+        out[i, 0] = points[i, 0] * scale_x
+        out[i, 1] = points[i, 1] * scale_y
+    return out
+
+
+@njit(cache=True)
+def fit_quadratic_or_linear(y, x):
+    """Compiled body of fit_quadratic"""
+    coeffs = polyfit_quadratic(y, x)
+    if np.isnan(coeffs[0]):
+        line = polyfit_linear(y, x)
+        coeffs[0] = 0.0 if np.isfinite(line[0]) else np.nan
+        coeffs[1] = line[0]
+        coeffs[2] = line[1]
+    return coeffs
+
+
+@njit(cache=True)
+def lane_pair_metrics(left_points, right_points, frame_width, frame_height,
+                      y_eval, min_curvature):
+    """
+    Fit, measure and validate both lanes in one call
+    
+    Args:
+        left_points: (N, 2) float64 left lane [x, y] points
+        right_points: (M, 2) float64 right lane [x, y] points
+        frame_width: Frame width
+        frame_height: Frame height
+        y_eval: Y position for the curvature and width
+        min_curvature: Smallest allowed radius, see lane_in_bounds
+    
+    Returns:
+        Tuple (coeffs, curvatures, valid, width): (2, 3) quadratic
+        coefficients (NaN rows for lanes that can't be fit), (2,) curvature
+        radii, (2,) validity flags and the lane width (NaN unless both lanes fit)
+    """
+    coeffs = np.empty((2, 3))
+    curvatures = np.full(2, np.inf)
+    valid = np.zeros(2, dtype=np.bool_)
+    fitted = np.zeros(2, dtype=np.bool_)
+    
+    for lane in range(2):
+        points = left_points if lane == 0 else right_points
+        fit = fit_quadratic_or_linear(points[:, 1], points[:, 0])
+        coeffs[lane] = fit
+        if np.isfinite(fit[0]) and np.isfinite(fit[1]) and np.isfinite(fit[2]):
+            fitted[lane] = True
+            curvatures[lane] = curvature_radius(fit[0], fit[1], y_eval)
+            valid[lane] = lane_in_bounds(fit, frame_width, frame_height, min_curvature)
+    
+    width = np.nan
+    if fitted[0] and fitted[1]:
+        width = abs(horner(coeffs[1], y_eval) - horner(coeffs[0], y_eval))
+    return coeffs, curvatures, valid, width
+
+
+def fit_quadratic(y, x):
+    """
+    Fit x = a*y^2 + b*y + c, dropping to a line when a quadratic is singular
+    
+    Args:
+        y: Y coordinates
+        x: X coordinates
+    
+    Returns:
+        Coefficients [a, b, c]; a is 0 for a linear fit and all are NaN
+        when no fit is possible (fewer than two distinct y values)
+    """
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    return fit_quadratic_or_linear(y, x)
+
+
+def warmup():
+    """Compile the kernels for the float64 signatures used at runtime"""
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        y = np.array([0.0, 1.0, 2.0, 3.0])
+        coeffs = polyfit_quadratic(y, y)
+        polyfit_linear(y, y)
+        curvature_radius(1.0, 0.0, 1.0)
+        lane_in_bounds(coeffs, 10.0, 10.0, 1.0)
+        points = np.empty((4, 2))
+        polyval_into(coeffs, y, points[:, 0])
+        lane_points_into(coeffs, 0.0, 3.0, points)
+        polyval_into(coeffs, y, np.empty(4))
+        eval_two_polys(coeffs, coeffs, y, np.empty((4, 2, 2)))
+        # Cached y values are read-only, which numba types separately
+        y_readonly = y.copy()
+        y_readonly.setflags(write=False)
+        eval_two_polys(coeffs, coeffs, y_readonly, np.empty((4, 2, 2)))
+        lane_pair_metrics(points, points, 10.0, 10.0, 3.0, 1.0)
+        scale_points(np.zeros((2, 2)), 1.0, 1.0)
+        scale_points(np.zeros((2, 2), dtype=np.float32), 1.0, 1.0)
+    except Exception as e:
+        logger.warning(f"Numba warmup failed: {e}")
+
+
+# Pay the compile cost at import rather than on the first frame
+warmup()
@@ -5,7 +5,10 @@ Includes polynomial fitting, curvature calculation, and lane analysis
 
 import numpy as np
 import logging
-from typing import Optional, Tuple, List
+from functools import lru_cache
+from typing import Optional, Tuple, List, Dict, Any
+
+from . import lane_numba
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +27,25 @@ def fit_lane_polynomial(lane_points: np.ndarray, degree: int = 2) -> Optional[np
     if lane_points is None or len(lane_points) < degree + 1:
         return None
     
-    try:
-        # Extract x and y coordinates
-        if lane_points.ndim == 2 and lane_points.shape[1] == 2:
-            x = lane_points[:, 0]
-            y = lane_points[:, 1]
+    # Extract x and y coordinates
+    if lane_points.ndim == 2 and lane_points.shape[1] == 2:
+        x = np.ascontiguousarray(lane_points[:, 0], dtype=np.float64)
+        y = np.ascontiguousarray(lane_points[:, 1], dtype=np.float64)
+    else:
+        logger.warning(f"Invalid lane points shape: {lane_points.shape}")
+        return None
+    
+    # Fit polynomial (x as function of y)
+    # This is more stable for near-vertical lanes
+    if degree in (1, 2):
+        # Closed-form least squares; the kernels skip NaN/inf points themselves
+        if degree == 2:
+            coeffs = lane_numba.fit_quadratic(y, x)
         else:
-            logger.warning(f"Invalid lane points shape: {lane_points.shape}")
-            return None
-        
+            coeffs = lane_numba.polyfit_linear(y, x)
+        return coeffs if np.all(np.isfinite(coeffs)) else None
+    
+    try:
         # Remove invalid points (NaN, inf)
         valid_mask = np.isfinite(x) & np.isfinite(y)
         x = x[valid_mask]
@@ -41,13 +54,9 @@ def fit_lane_polynomial(lane_points: np.ndarray, degree: int = 2) -> Optional[np
         if len(x) < degree + 1:
             return None
         
-        # Fit polynomial (x as function of y)
-        # This is more stable for near-vertical lanes
-        coeffs = np.polyfit(y, x, degree)
-        
-        return coeffs
+        return np.polyfit(y, x, degree)
     
-    except Exception as e:
+    except np.linalg.LinAlgError as e:
         logger.warning(f"Error fitting polynomial: {e}")
         return None
 
@@ -66,28 +75,11 @@ def calculate_curvature(poly_coeffs: np.ndarray, y_eval: float) -> float:
     if poly_coeffs is None or len(poly_coeffs) < 3:
         return float('inf')
     
-    try:
-        # For polynomial x = a*y^2 + b*y + c
-        # First derivative: dx/dy = 2*a*y + b
-        # Second derivative: d2x/dy2 = 2*a
-        # Curvature: ((1 + (dx/dy)^2)^(3/2)) / |d2x/dy2|
-        
-        a = poly_coeffs[0]
-        b = poly_coeffs[1]
-        
-        dx_dy = 2 * a * y_eval + b
-        d2x_dy2 = 2 * a
-        
-        if abs(d2x_dy2) < 1e-6:
-            return float('inf')
-        
-        curvature = ((1 + dx_dy**2)**1.5) / abs(d2x_dy2)
-        
-        return curvature
-    
-    except Exception as e:
-        logger.warning(f"Error calculating curvature: {e}")
-        return float('inf')
+    # For polynomial x = a*y^2 + b*y + c
+    # First derivative: dx/dy = 2*a*y + b
+    # Second derivative: d2x/dy2 = 2*a
+    # Curvature: ((1 + (dx/dy)^2)^(3/2)) / |d2x/dy2|
+    return lane_numba.curvature_radius(float(poly_coeffs[0]), float(poly_coeffs[1]), float(y_eval))
 
 
 def calculate_curvature_meters(poly_coeffs: np.ndarray, y_eval: float,
@@ -108,32 +100,16 @@ def calculate_curvature_meters(poly_coeffs: np.ndarray, y_eval: float,
     if poly_coeffs is None or len(poly_coeffs) < 3:
         return float('inf')
     
-    try:
-        # Convert polynomial to world space
-        # If x = a*y^2 + b*y + c in pixel space
-        # Then x_m = a_m*y_m^2 + b_m*y_m + c_m in world space
-        # where a_m = a * xm_per_pix / (ym_per_pix^2)
-        #       b_m = b * xm_per_pix / ym_per_pix
-        #       c_m = c * xm_per_pix
-        
-        a = poly_coeffs[0] * xm_per_pix / (ym_per_pix**2)
-        b = poly_coeffs[1] * xm_per_pix / ym_per_pix
-        
-        y_eval_m = y_eval * ym_per_pix
-        
-        dx_dy = 2 * a * y_eval_m + b
-        d2x_dy2 = 2 * a
-        
-        if abs(d2x_dy2) < 1e-6:
-            return float('inf')
-        
-        curvature = ((1 + dx_dy**2)**1.5) / abs(d2x_dy2)
-        
-        return curvature
+    # Convert polynomial to world space
+    # If x = a*y^2 + b*y + c in pixel space
+    # Then x_m = a_m*y_m^2 + b_m*y_m + c_m in world space
+    # where a_m = a * xm_per_pix / (ym_per_pix^2)
+    #       b_m = b * xm_per_pix / ym_per_pix
+    #       c_m = c * xm_per_pix
+    a = float(poly_coeffs[0]) * xm_per_pix / (ym_per_pix**2)
+    b = float(poly_coeffs[1]) * xm_per_pix / ym_per_pix
     
-    except Exception as e:
-        logger.warning(f"Error calculating curvature in meters: {e}")
-        return float('inf')
+    return lane_numba.curvature_radius(a, b, float(y_eval) * ym_per_pix)
 
 
 def evaluate_polynomial(poly_coeffs: np.ndarray, y_values: np.ndarray) -> Optional[np.ndarray]:
@@ -150,12 +126,15 @@ def evaluate_polynomial(poly_coeffs: np.ndarray, y_values: np.ndarray) -> Option
     if poly_coeffs is None:
         return None
     
-    try:
-        x_values = np.polyval(poly_coeffs, y_values)
-        return x_values
-    except Exception as e:
-        logger.warning(f"Error evaluating polynomial: {e}")
-        return None
+    coeffs = np.ascontiguousarray(poly_coeffs, dtype=np.float64)
+    y = np.ascontiguousarray(y_values, dtype=np.float64)
+    if y.ndim == 0:
+        return lane_numba.horner(coeffs, float(y))
+    
+    # Evaluate over the flattened values; reshape(-1) of the fresh output is a view
+    out = np.empty_like(y)
+    lane_numba.polyval_into(coeffs, y.reshape(-1), out.reshape(-1))
+    return out
 
 
 def generate_lane_points(poly_coeffs: np.ndarray, y_start: int, y_end: int, 
@@ -175,16 +154,52 @@ def generate_lane_points(poly_coeffs: np.ndarray, y_start: int, y_end: int,
     if poly_coeffs is None:
         return None
     
-    try:
-        y_values = np.linspace(y_start, y_end, num_points)
-        x_values = np.polyval(poly_coeffs, y_values)
-        
-        points = np.column_stack((x_values, y_values))
+    # Both columns are written in one pass into a single C-contiguous array,
+    # with no linspace or x temporaries to stack
+    points = np.empty((num_points, 2), dtype=np.float64)
+    coeffs = np.ascontiguousarray(poly_coeffs, dtype=np.float64)
+    return lane_numba.lane_points_into(coeffs, float(y_start), float(y_end), points)
+
+
+def generate_lane_pair_points(left_poly: np.ndarray, right_poly: np.ndarray,
+                              y_start: int, y_end: int, num_points: int = 50,
+                              out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    Generate points for both lanes in a single pass
+    
+    Args:
+        left_poly: Left lane polynomial coefficients
+        right_poly: Right lane polynomial coefficients
+        y_start: Starting y coordinate
+        y_end: Ending y coordinate
+        num_points: Number of points per lane
+        out: Optional (num_points, 2, 2) float64 array to reuse across frames
         
-        return points
-    except Exception as e:
-        logger.warning(f"Error generating lane points: {e}")
+    Returns:
+        Array (Nx2x2) where [:, 0] are left and [:, 1] are right [x, y] points, or None
+    """
+    if left_poly is None or right_poly is None:
         return None
+    
+    if out is None:
+        out = np.empty((num_points, 2, 2))
+    y_values = _cached_linspace(float(y_start), float(y_end), num_points)
+    return lane_numba.eval_two_polys(np.ascontiguousarray(left_poly, dtype=np.float64),
+                                     np.ascontiguousarray(right_poly, dtype=np.float64),
+                                     y_values, out)
+
+
+@lru_cache(maxsize=8)
+def _cached_linspace(y_start: float, y_end: float, num_points: int) -> np.ndarray:
+    """
+    np.linspace for the few y ranges used frame after frame
+    
+    Returns:
+        Read-only array shared between callers
+    """
+    y_values = np.linspace(y_start, y_end, num_points)
+    y_values.setflags(write=False)
+    return y_values
 
 
 def calculate_lane_width(left_poly: np.ndarray, right_poly: np.ndarray, 
@@ -203,16 +218,57 @@ def calculate_lane_width(left_poly: np.ndarray, right_poly: np.ndarray,
     if left_poly is None or right_poly is None:
         return None
     
-    try:
-        left_x = np.polyval(left_poly, y_eval)
-        right_x = np.polyval(right_poly, y_eval)
-        
-        width = abs(right_x - left_x)
+    left_x = lane_numba.horner(np.ascontiguousarray(left_poly, dtype=np.float64), float(y_eval))
+    right_x = lane_numba.horner(np.ascontiguousarray(right_poly, dtype=np.float64), float(y_eval))
+    
+    return abs(right_x - left_x)
+
+
+def analyze_lane_pair(left_points: Optional[np.ndarray], right_points: Optional[np.ndarray],
+                      frame_width: int, frame_height: int,
+                      y_eval: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Fit, measure and validate both lanes of a frame in one compiled call
+    
+    Equivalent to fit_lane_polynomial, calculate_curvature,
+    validate_lane_polynomial and calculate_lane_width on each lane, without
+    the per-helper Python overhead.
+    
+    Args:
+        left_points: Left lane points (Nx2) or None
+        right_points: Right lane points (Nx2) or None
+        frame_width: Frame width
+        frame_height: Frame height
+        y_eval: Y position for curvature and width (default: frame bottom)
         
-        return width
-    except Exception as e:
-        logger.warning(f"Error calculating lane width: {e}")
-        return None
+    Returns:
+        Dictionary with left/right 'poly', 'curvature' and 'valid' entries
+        and 'lane_width' (None when a lane can't be fit)
+    """
+    if y_eval is None:
+        y_eval = frame_height
+    
+    lanes = []
+    for points in (left_points, right_points):
+        # Same minimum as fit_lane_polynomial for a quadratic
+        if points is None or points.ndim != 2 or points.shape[1] != 2 or len(points) < 3:
+            points = np.empty((0, 2))
+        lanes.append(np.ascontiguousarray(points, dtype=np.float64))
+    
+    coeffs, curvatures, valid, width = lane_numba.lane_pair_metrics(
+        lanes[0], lanes[1], float(frame_width), float(frame_height), float(y_eval), 50.0
+    )
+    fitted = np.isfinite(coeffs).all(axis=1)
+    
+    return {
+        'left_poly': coeffs[0] if fitted[0] else None,
+        'right_poly': coeffs[1] if fitted[1] else None,
+        'left_curvature': float(curvatures[0]),
+        'right_curvature': float(curvatures[1]),
+        'left_valid': bool(valid[0]),
+        'right_valid': bool(valid[1]),
+        'lane_width': float(width) if np.isfinite(width) else None
+    }
 
 
 def smooth_lane_polynomial(poly_history: List[np.ndarray], 
@@ -249,6 +305,74 @@ def smooth_lane_polynomial(poly_history: List[np.ndarray],
         return None
 
 
+class PolyHistory:
+    """
+    Moving average of lane polynomials over the last few frames
+    
+    Streaming counterpart of smooth_lane_polynomial: coefficients live in a
+    fixed ring buffer with a running sum, so each frame costs O(degree)
+    whatever the window size.
+    """
+    
+    def __init__(self, window_size: int = 5, degree: int = 2):
+        """
+        Initialize history
+        
+        Args:
+            window_size: Number of frames to average
+            degree: Polynomial degree of the pushed coefficients
+        """
+        self.window_size = window_size
+        self.buf = np.zeros((window_size, degree + 1))
+        self.valid_mask = np.zeros(window_size, dtype=bool)
+        self.running_sum = np.zeros(degree + 1)
+        self.count = 0
+        self.head = 0
+    
+    def push(self, poly_coeffs: Optional[np.ndarray]):
+        """
+        Add the coefficients of a new frame, dropping the oldest frame
+        
+        Args:
+            poly_coeffs: Polynomial coefficients, or None for a frame without a lane
+        """
+        head = self.head
+        if self.valid_mask[head]:
+            self.running_sum -= self.buf[head]
+            self.count -= 1
+        
+        if poly_coeffs is None:
+            self.valid_mask[head] = False
+        else:
+            self.buf[head] = poly_coeffs
+            self.valid_mask[head] = True
+            self.running_sum += self.buf[head]
+            self.count += 1
+        
+        self.head = (head + 1) % self.window_size
+        if self.head == 0:
+            # Resum once per lap so rounding errors can't build up
+            self.running_sum = self.buf[self.valid_mask].sum(axis=0)
+    
+    def smoothed(self) -> Optional[np.ndarray]:
+        """
+        Average of the valid coefficients in the window
+        
+        Returns:
+            Smoothed polynomial coefficients or None if there are none
+        """
+        if self.count == 0:
+            return None
+        return self.running_sum / self.count
+    
+    def clear(self):
+        """Forget all frames"""
+        self.valid_mask[:] = False
+        self.running_sum[:] = 0.0
+        self.count = 0
+        self.head = 0
+
+
 def validate_lane_polynomial(poly_coeffs: np.ndarray, frame_width: int, 
                             frame_height: int) -> bool:
     """
@@ -265,33 +389,12 @@ def validate_lane_polynomial(poly_coeffs: np.ndarray, frame_width: int,
     if poly_coeffs is None:
         return False
     
-    try:
-        # Check if polynomial produces reasonable x values
-        y_bottom = frame_height
-        y_top = frame_height * 0.6
-        
-        x_bottom = np.polyval(poly_coeffs, y_bottom)
-        x_top = np.polyval(poly_coeffs, y_top)
-        
-        # Check if x values are within frame bounds (with margin)
-        margin = frame_width * 0.2
-        if x_bottom < -margin or x_bottom > frame_width + margin:
-            return False
-        if x_top < -margin or x_top > frame_width + margin:
-            return False
-        
-        # Check if curvature is reasonable (not too sharp)
-        curvature = calculate_curvature(poly_coeffs, frame_height * 0.8)
-        min_curvature = 50  # pixels
-        
-        if curvature < min_curvature:
-            return False
-        
-        return True
-    
-    except Exception as e:
-        logger.warning(f"Error validating polynomial: {e}")
-        return False
+    # x values at the bottom and 60% height must lie within the frame (with
+    # a 20% margin) and the curvature must not be too sharp
+    min_curvature = 50.0  # pixels
+    coeffs = np.ascontiguousarray(poly_coeffs, dtype=np.float64)
+    return bool(lane_numba.lane_in_bounds(coeffs, float(frame_width), float(frame_height),
+                                          min_curvature))
 
 
 def convert_line_to_polynomial(line: np.ndarray) -> Optional[np.ndarray]:
@@ -307,16 +410,12 @@ def convert_line_to_polynomial(line: np.ndarray) -> Optional[np.ndarray]:
     if line is None or len(line) != 4:
         return None
     
-    try:
-        x1, y1, x2, y2 = line
-        
-        # Fit linear polynomial
-        y_points = np.array([y1, y2])
-        x_points = np.array([x1, x2])
-        
-        coeffs = np.polyfit(y_points, x_points, 1)
-        
-        return coeffs
-    except Exception as e:
-        logger.warning(f"Error converting line to polynomial: {e}")
+    x1, y1, x2, y2 = (float(v) for v in line)
+    
+    # A horizontal line has no x = f(y) form
+    if y1 == y2:
         return None
+    
+    # Line through both points, the exact solution of a degree-1 fit
+    slope = (x2 - x1) / (y2 - y1)
+    return np.array([slope, x1 - slope * y1])
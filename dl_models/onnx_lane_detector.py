@@ -5,21 +5,27 @@ Supports ONNX format lane detection models
 
 import cv2
 import numpy as np
+import os
 import time
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from .dl_lane_detector import DLLaneDetector
 from .lane_detection_result import LaneDetectionResult
 
 logger = logging.getLogger(__name__)
 
+# Sessions shared by every detector, keyed by (model path, providers), so
+# re-creating a detector doesn't rebuild the graph, arena and thread pools
+_SESSION_CACHE: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
 
 class ONNXLaneDetector(DLLaneDetector):
     """ONNX-based lane detector"""
     
     def __init__(self, model_path: str, device: str = 'cpu', 
-                 conf_threshold: float = 0.6, input_size: Tuple[int, int] = (288, 800)):
+                 conf_threshold: float = 0.6, input_size: Tuple[int, int] = (288, 800),
+                 precision: str = 'auto'):
         """
         Initialize ONNX Lane Detector
         
@@ -28,11 +34,20 @@ class ONNXLaneDetector(DLLaneDetector):
             device: Inference device ('cuda', 'cpu')
             conf_threshold: Confidence threshold
             input_size: Model input size (height, width)
+            precision: Model precision ('auto', 'fp32', 'int8', 'fp16'). 'auto'
+                uses an INT8 model on CPU and an FP16 model on CUDA when one
+                is available next to a '*.fp32.onnx' model
         """
         super().__init__(model_path, 'onnx', device, conf_threshold, input_size)
+        self.precision = precision
         self.session = None
         self.input_name = None
         self.output_names = None
+        self._io_binding = None
+        self._input_buf = None
+        self._input_value = None
+        self._output_arrays = None
+        self._on_cuda = False
         
         # Try to load model
         if not self.load_model():
@@ -53,8 +68,14 @@ class ONNXLaneDetector(DLLaneDetector):
             
             providers.append('CPUExecutionProvider')
             
-            # Create inference session
-            self.session = ort.InferenceSession(self.model_path, providers=providers)
+            model_path = self._select_model_path(providers[0] == 'CUDAExecutionProvider')
+            
+            cache_key = (os.path.abspath(model_path), tuple(providers))
+            self.session = _SESSION_CACHE.get(cache_key)
+            is_new_session = self.session is None
+            if is_new_session:
+                self.session = self._create_session(ort, model_path, providers)
+                _SESSION_CACHE[cache_key] = self.session
             
             # Get input/output info
             self.input_name = self.session.get_inputs()[0].name
@@ -62,9 +83,35 @@ class ONNXLaneDetector(DLLaneDetector):
             
             input_shape = self.session.get_inputs()[0].shape
             
+            # A static input fixes the size; resize straight to it. Models
+            # exported channels-last (N, H, W, 3) skip the CHW transpose
+            if len(input_shape) == 4:
+                if input_shape[3] == 3 and input_shape[1] != 3:
+                    self.input_layout = 'nhwc'
+                    spatial = input_shape[1:3]
+                else:
+                    spatial = input_shape[2:4]
+                if all(isinstance(d, int) for d in spatial):
+                    self.input_size = (spatial[0], spatial[1])
+                    self._resize_buf = np.empty((spatial[0], spatial[1], 3), dtype=np.uint8)
+                    self._rgb_buf = np.empty_like(self._resize_buf)
+            
+            # Persistent input tensor, C-contiguous float32 by construction;
+            # every frame is preprocessed into it
+            height, width = self.input_size
+            if self.input_layout == 'nhwc':
+                self._input_buf = np.empty((1, height, width, 3), dtype=np.float32)
+            else:
+                self._input_buf = np.empty((1, 3, height, width), dtype=np.float32)
+            
+            self._io_binding = self._create_io_binding(ort)
+            
+            if is_new_session:
+                self._warmup()
+            
             self.is_loaded = True
             
-            logger.info(f"ONNX model loaded successfully")
+            logger.info(f"ONNX model loaded successfully ({model_path}, {self.precision})")
             logger.info(f"Input: {self.input_name}, Shape: {input_shape}")
             logger.info(f"Outputs: {self.output_names}")
             logger.info(f"Providers: {self.session.get_providers()}")
@@ -78,6 +125,197 @@ class ONNXLaneDetector(DLLaneDetector):
             logger.error(f"Error loading ONNX model: {e}")
             return False
     
+    @staticmethod
+    def _create_session(ort, model_path: str, providers: List[str]):
+        """
+        Create an inference session tuned for one frame at a time
+        
+        Args:
+            ort: The onnxruntime module
+            model_path: Path of the model file
+            providers: Execution providers in priority order
+            
+        Returns:
+            InferenceSession
+        """
+        sess_options = ort.SessionOptions()
+        # Let ORT fuse and constant-fold the whole graph up front
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Fixed shapes let ORT plan and reuse its intermediate allocations
+        sess_options.enable_mem_pattern = True
+        # A single frame has no independent branches worth a second pool;
+        # leave half the cores to the capture, YOLO and render threads
+        sess_options.inter_op_num_threads = 1
+        sess_options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        # Use the process-wide allocator when one is registered
+        sess_options.add_session_config_entry('session.use_env_allocators', '1')
+        
+        return ort.InferenceSession(model_path, sess_options=sess_options, providers=providers)
+    
+    def _warmup(self):
+        """Run one blank frame so allocation planning doesn't stall the first real frame"""
+        try:
+            self._input_buf.fill(0)
+            self._infer(self._input_buf)
+        except Exception as e:
+            logger.warning(f"ONNX warmup run failed: {e}")
+    
+    def _select_model_path(self, on_cuda: bool) -> str:
+        """
+        Pick the model file for the requested precision
+        
+        Reduced-precision variants live next to the FP32 model, with
+        '.fp32.onnx' replaced by '.int8.onnx' or '.fp16.onnx'. A missing
+        INT8 model is generated once with dynamic quantization; a missing
+        FP16 model falls back to FP32. Sets self.precision to the precision
+        actually used.
+        
+        Args:
+            on_cuda: Whether the session will run on the CUDA provider
+            
+        Returns:
+            Path of the model file to load
+        """
+        precision = self.precision
+        if precision == 'auto':
+            precision = 'fp16' if on_cuda else 'int8'
+        
+        if precision == 'fp32' or not self.model_path.endswith('.fp32.onnx'):
+            self.precision = 'fp32'
+            return self.model_path
+        
+        variant_path = self.model_path[:-len('.fp32.onnx')] + f'.{precision}.onnx'
+        if precision == 'int8' and not os.path.exists(variant_path):
+            try:
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                quantize_dynamic(self.model_path, variant_path, weight_type=QuantType.QInt8)
+                logger.info(f"Quantized {self.model_path} to {variant_path}")
+            except Exception as e:
+                logger.warning(f"INT8 quantization failed, using FP32 model: {e}")
+        
+        if not os.path.exists(variant_path):
+            if precision == 'fp16':
+                logger.warning(f"FP16 model {variant_path} not found, using FP32 model")
+            self.precision = 'fp32'
+            return self.model_path
+        
+        self.precision = precision
+        return variant_path
+    
+    def _create_io_binding(self, ort):
+        """
+        Bind the model inputs and outputs once so inference doesn't allocate them per call
+        
+        A static input binds the persistent host tensor that frames are
+        preprocessed into; on CPU it is bound directly, on CUDA it is copied
+        into a persistent device buffer. Outputs with a fully static shape get
+        a preallocated buffer on the session's device; the rest are left to
+        ORT to allocate there. When every output is static and on the CPU,
+        ORT writes straight into numpy arrays that are returned as is.
+        
+        Args:
+            ort: The onnxruntime module
+            
+        Returns:
+            IOBinding, or None if binding isn't supported
+        """
+        try:
+            on_cuda = self.session.get_providers()[0] == 'CUDAExecutionProvider'
+            device = 'cuda' if on_cuda else 'cpu'
+            binding = self.session.io_binding()
+            
+            # Dynamic batch is fine, we always send one frame
+            input_shape = list(self.session.get_inputs()[0].shape)
+            if input_shape and not isinstance(input_shape[0], int):
+                input_shape[0] = 1
+            if tuple(input_shape) == self._input_buf.shape:
+                if on_cuda:
+                    self._input_value = ort.OrtValue.ortvalue_from_shape_and_type(
+                        input_shape, np.float32, device, 0
+                    )
+                else:
+                    # Shares memory with _input_buf
+                    self._input_value = ort.OrtValue.ortvalue_from_numpy(self._input_buf)
+                binding.bind_ortvalue_input(self.input_name, self._input_value)
+            self._on_cuda = on_cuda
+            
+            output_arrays = []
+            for output in self.session.get_outputs():
+                if not all(isinstance(d, int) for d in output.shape):
+                    binding.bind_output(output.name, device)
+                    output_arrays = None
+                elif on_cuda:
+                    buffer = ort.OrtValue.ortvalue_from_shape_and_type(
+                        output.shape, np.float32, device, 0
+                    )
+                    binding.bind_ortvalue_output(output.name, buffer)
+                    output_arrays = None
+                else:
+                    array = np.empty(output.shape, dtype=np.float32)
+                    binding.bind_ortvalue_output(output.name, ort.OrtValue.ortvalue_from_numpy(array))
+                    if output_arrays is not None:
+                        output_arrays.append(array)
+            self._output_arrays = output_arrays
+            return binding
+        except Exception as e:
+            logger.warning(f"IO binding unavailable, using session.run: {e}")
+            return None
+    
+    def _run(self, frame: np.ndarray):
+        """Preprocess a frame and run inference, through the IO binding when one was created"""
+        return self._infer(self.preprocess_frame(frame, out=self._input_buf))
+    
+    def _infer(self, input_tensor: np.ndarray):
+        """
+        Run inference on a preprocessed tensor
+        
+        Args:
+            input_tensor: Preprocessed input tensor
+            
+        Returns:
+            List of model outputs on the CPU
+        """
+        if self._io_binding is None:
+            return self.session.run(self.output_names, {self.input_name: input_tensor})
+        
+        if self._input_value is None:
+            self._io_binding.bind_cpu_input(self.input_name, input_tensor)
+        elif self._on_cuda:
+            self._input_value.update_inplace(input_tensor)
+        
+        self.session.run_with_iobinding(self._io_binding)
+        if self._output_arrays is not None:
+            # ORT wrote into these arrays; nothing to fetch
+            return self._output_arrays
+        return self._io_binding.copy_outputs_to_cpu()
+    
+    def _make_result(self, outputs, original_shape: Tuple[int, int],
+                     start_time: float) -> LaneDetectionResult:
+        """Postprocess model outputs into a LaneDetectionResult"""
+        processed = self.postprocess_output(outputs, original_shape)
+        
+        return LaneDetectionResult(
+            left_lane=processed.get('left_lane'),
+            right_lane=processed.get('right_lane'),
+            confidence=processed.get('confidence', 0.0),
+            lane_type=processed.get('lane_type', 'unknown'),
+            success=processed.get('success', False),
+            processing_time=time.time() - start_time,
+            model_used='dl'
+        )
+    
+    @staticmethod
+    def _failed_result(start_time: Optional[float] = None) -> LaneDetectionResult:
+        """Empty result for a frame that couldn't be processed"""
+        return LaneDetectionResult(
+            left_lane=None,
+            right_lane=None,
+            confidence=0.0,
+            success=False,
+            processing_time=time.time() - start_time if start_time is not None else 0.0,
+            model_used='dl'
+        )
+    
     def detect_lanes(self, frame: np.ndarray) -> LaneDetectionResult:
         """
         Detect lanes using ONNX model
@@ -89,52 +327,29 @@ class ONNXLaneDetector(DLLaneDetector):
             LaneDetectionResult
         """
         if not self.is_loaded:
-            return LaneDetectionResult(
-                left_lane=None,
-                right_lane=None,
-                confidence=0.0,
-                success=False,
-                model_used='dl'
-            )
+            return self._failed_result()
         
         start_time = time.time()
         
         try:
-            # Preprocess frame
-            input_tensor = self.preprocess_frame(frame)
-            
-            # Run inference
-            outputs = self.session.run(self.output_names, {self.input_name: input_tensor})
+            # Preprocess frame and run inference
+            outputs = self._run(frame)
             
             # Postprocess output
-            original_shape = (frame.shape[0], frame.shape[1])
-            processed = self.postprocess_output(outputs, original_shape)
-            
-            processing_time = time.time() - start_time
-            
-            # Create result
-            result = LaneDetectionResult(
-                left_lane=processed.get('left_lane'),
-                right_lane=processed.get('right_lane'),
-                confidence=processed.get('confidence', 0.0),
-                lane_type=processed.get('lane_type', 'unknown'),
-                success=processed.get('success', False),
-                processing_time=processing_time,
-                model_used='dl'
-            )
-            
-            return result
+            return self._make_result(outputs, (frame.shape[0], frame.shape[1]), start_time)
         
         except Exception as e:
             logger.error(f"Error during lane detection: {e}")
-            return LaneDetectionResult(
-                left_lane=None,
-                right_lane=None,
-                confidence=0.0,
-                success=False,
-                processing_time=time.time() - start_time,
-                model_used='dl'
-            )
+            return self._failed_result(start_time)
+    
+    @staticmethod
+    def _nonzero_rows(points: np.ndarray) -> np.ndarray:
+        """Boolean mask of the points with any non-zero coordinate"""
+        if points.ndim == 2 and points.shape[1] == 2:
+            # Compare the two column views directly instead of building an
+            # (N, 2) bool array and reducing it
+            return (points[:, 0] != 0) | (points[:, 1] != 0)
+        return np.any(points != 0, axis=1)
     
     def postprocess_output(self, model_output: Any, original_shape: Tuple[int, int]) -> Dict[str, Any]:
         """
@@ -187,21 +402,19 @@ class ONNXLaneDetector(DLLaneDetector):
                         right_lane_points = output[1]
                         
                         # Filter valid points (non-zero or within bounds)
-                        left_valid = left_lane_points[np.any(left_lane_points != 0, axis=1)]
-                        right_valid = right_lane_points[np.any(right_lane_points != 0, axis=1)]
+                        left_valid = left_lane_points[self._nonzero_rows(left_lane_points)]
+                        right_valid = right_lane_points[self._nonzero_rows(right_lane_points)]
                         
                         if len(left_valid) > 0:
                             # Scale to original size
-                            scaled_left = self.scale_lanes_to_original(
-                                {'left': left_valid}, original_shape
+                            result['left_lane'] = self.scale_points_to_original(
+                                left_valid, original_shape
                             )
-                            result['left_lane'] = scaled_left.get('left')
                         
                         if len(right_valid) > 0:
-                            scaled_right = self.scale_lanes_to_original(
-                                {'right': right_valid}, original_shape
+                            result['right_lane'] = self.scale_points_to_original(
+                                right_valid, original_shape
                             )
-                            result['right_lane'] = scaled_right.get('right')
                         
                         # Calculate confidence (simplified)
                         if result['left_lane'] is not None or result['right_lane'] is not None:
@@ -247,8 +460,10 @@ class ONNXLaneDetector(DLLaneDetector):
                 y1 = frame_height
                 y2 = int(frame_height * 0.6)
                 
-                x1 = int(np.polyval(poly_coeffs, y1))
-                x2 = int(np.polyval(poly_coeffs, y2))
+                # Inline Horner on scalars; a linear fit has no y^2 term
+                a, b, c = (0.0,) * (3 - len(poly_coeffs)) + tuple(poly_coeffs.tolist())
+                x1 = int((a * y1 + b) * y1 + c)
+                x2 = int((a * y2 + b) * y2 + c)
                 
                 return np.array([x1, y1, x2, y2])
         
@@ -3,34 +3,91 @@ Enhanced Flask Web Application for ADAS System - Phase 5 (Modern Edition)
 Real-time streaming with WebSocket support, interactive controls, and modern UI
 """
 
+import atexit
 import cv2
 import os
+import queue
+import shutil
 import threading
 import time
 import json
 import logging
 from datetime import datetime
 from flask import Flask, render_template, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from werkzeug.utils import secure_filename
 from enhanced_adas_system import EnhancedADASSystem
 from utils.config_loader import ConfigLoader
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify through orjson, which also serializes numpy scalars and arrays"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB
 app.config['SECRET_KEY'] = 'adas-enhanced-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
+JPEG_QUALITY = 85
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Each stage hands over at most this many frames; older ones are dropped
+STAGE_QUEUE_SIZE = 2
+# Shortest gap between stats pushes while streaming (5 Hz)
+STATS_EMIT_INTERVAL = 0.2
+# How long polled status payloads are reused (seconds)
+STATUS_TTL = 0.1
+SYSTEM_INFO_TTL = 0.5
 
 # Global state management
+# Shared libjpeg-turbo encoder (the handle is reusable across frames and threads)
+_tj = None
+if TurboJPEG is not None:
+    try:
+        _tj = TurboJPEG()
+    except Exception as e:
+        logger.warning(f"libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+
 class ADASState:
     def __init__(self):
+        # Decode -> infer -> encode stages, each on its own thread
+        self.decode_q = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+        self.encode_q = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+        # The latest encoded frame, shared by every stream client
+        self.frame_cond = threading.Condition()
+        self.latest_jpeg = None
+        self.frame_seq = 0
+        self.pipeline_stop = threading.Event()
+        self.pipeline_threads = []
+        # Stream requests start the pipeline concurrently; one set of threads at a time
+        self.pipeline_lock = threading.Lock()
+        self.last_stats_emit = 0.0
         self.video_capture = None
         self.current_video_path = None
         self.processing_active = False
@@ -48,6 +105,35 @@ class ADASState:
             'source': 'idle'
         }
         self.connected_clients = set()
+    
+    def start_pipeline(self):
+        """Start the decode, infer and encode threads if they aren't running"""
+        with self.pipeline_lock:
+            if any(t.is_alive() for t in self.pipeline_threads):
+                return
+            self.pipeline_stop = threading.Event()
+            for q in (self.decode_q, self.encode_q):
+                _drain(q)
+            self.pipeline_threads = [
+                threading.Thread(target=target, args=(self.pipeline_stop,), name=name, daemon=True)
+                for target, name in ((_decode_loop, 'adas-decode'),
+                                     (_infer_loop, 'adas-infer'),
+                                     (_encode_loop, 'adas-encode'))
+            ]
+            for t in self.pipeline_threads:
+                t.start()
+    
+    def stop_pipeline(self):
+        """Stop the stage threads and wait for their current frame to finish"""
+        with self.pipeline_lock:
+            self.pipeline_stop.set()
+            for t in self.pipeline_threads:
+                t.join(timeout=2.0)
+            self.pipeline_threads = []
+            for q in (self.decode_q, self.encode_q):
+                _drain(q)
+            with self.frame_cond:
+                self.latest_jpeg = None
 
 state = ADASState()
 
@@ -62,92 +148,273 @@ def init_enhanced_adas():
     if state.enhanced_adas is None:
         logger.info("Initializing Enhanced ADAS System...")
         state.config_loader = ConfigLoader()
-        state.enhanced_adas = EnhancedADASSystem(yolo_model='yolov8n.pt', conf_threshold=0.5)
+        adas = EnhancedADASSystem(yolo_model='yolov8n.pt', conf_threshold=0.5)
+        # Pay the model cold-start cost here rather than on the first streamed frame
+        adas.warmup()
+        # Stop the system's worker threads when the server exits
+        atexit.register(adas.shutdown)
+        state.enhanced_adas = adas
         logger.info("Enhanced ADAS System initialized!")
     return state.enhanced_adas
 
 
-def broadcast_stats():
-    """Broadcast stats to all connected clients"""
-    socketio.emit('stats_update', {
+def _stats_payload():
+    """Stats as sent to clients in 'stats_update'"""
+    return {
         'fps': round(state.stats['current_fps'], 2),
         'frames': state.stats['processed_frames'],
         'errors': state.stats['errors'],
         'source': state.stats['source'],
         'avg_time': round(state.stats['avg_frame_time'], 2)
-    }, broadcast=True)
+    }
 
 
-def generate_frames():
-    """Generate video frames with ADAS processing"""
-    if state.enhanced_adas is None:
-        init_enhanced_adas()
+def broadcast_stats():
+    """Broadcast stats to all connected clients"""
+    # The server-level emit goes to every client
+    socketio.emit('stats_update', _stats_payload())
+
+
+def _maybe_broadcast_stats():
+    """Broadcast stats unless they were sent less than STATS_EMIT_INTERVAL ago"""
+    now = time.monotonic()
+    if now - state.last_stats_emit < STATS_EMIT_INTERVAL:
+        return
+    state.last_stats_emit = now
+    broadcast_stats()
+    # Let the server's socket loop flush the emit before the next frame
+    socketio.sleep(0)
+
+
+def _drain(q):
+    """Discard everything waiting in a queue"""
+    try:
+        while True:
+            q.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def _put_latest(q, item):
+    """Put item on a bounded queue, dropping the oldest entry when it is full"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _hand_over(q, item, timeout=0.5):
+    """
+    Put item on a bounded queue, waiting briefly for room
     
-    state.stats['start_time'] = time.time()
-    state.stats['processed_frames'] = 0
+    Batches arrive in bursts, so downstream stages get a moment to catch
+    up before the oldest entry is dropped.
+    """
+    try:
+        q.put(item, timeout=timeout)
+    except queue.Full:
+        _put_latest(q, item)
+
+
+def _publish_frame(jpeg):
+    """Make jpeg the current stream frame and wake every waiting client"""
+    with state.frame_cond:
+        state.latest_jpeg = jpeg
+        state.frame_seq += 1
+        state.frame_cond.notify_all()
+
+
+def _record_error(e):
+    """Count a pipeline error in the stats"""
+    state.stats['errors'] += 1
+    state.stats['last_error'] = str(e)
+
+
+def _decode_loop(stop_event):
+    """Read frames from the current capture into decode_q at the source frame rate"""
+    next_deadline = time.monotonic()
+    
+    while not stop_event.is_set():
+        try:
+            # The lock only guards the capture against the control handlers
+            with state.frame_lock:
+                cap = state.video_capture
+                ret, frame = False, None
+                fps = 0
+                if cap is not None and cap.isOpened():
+                    ret, frame = cap.read()
+                    if not ret and state.current_video_path:
+                        # Loop video
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        ret, frame = cap.read()
+                    fps = cap.get(cv2.CAP_PROP_FPS)
+            
+            if not ret:
+                # Webcam: wait for the next frame, otherwise back off
+                stop_event.wait(0.033 if cap is not None and not state.current_video_path else 0.1)
+                next_deadline = time.monotonic()
+                continue
+            
+            _put_latest(state.decode_q, frame)
+        
+        except Exception as e:
+            logger.error(f"Frame decode error: {e}")
+            _record_error(e)
+            stop_event.wait(0.1)
+            continue
+        
+        # Files are paced to their frame rate; a webcam read already blocks
+        if state.current_video_path:
+            next_deadline += 1.0 / (fps if fps and fps > 0 else 30.0)
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+            else:
+                next_deadline = time.monotonic()
+
+
+def _collect_batch(stop_event, batch_size, frame_wait):
+    """
+    Take up to batch_size frames from decode_q
+    
+    Blocks for the first frame, then waits at most frame_wait for each
+    further one so a stalled source doesn't hold back a partial batch.
+    """
+    batch = []
+    while not batch:
+        if stop_event.is_set():
+            return batch
+        try:
+            batch.append(state.decode_q.get(timeout=0.1))
+        except queue.Empty:
+            continue
+    while len(batch) < batch_size:
+        try:
+            batch.append(state.decode_q.get(timeout=frame_wait))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _infer_loop(stop_event):
+    """Run the ADAS pipeline on batches of decoded frames and pass the results to encode_q"""
+    adas = init_enhanced_adas()
     frame_times = []
     
-    while state.processing_active:
-        frame_bytes = None
-        frame_start = time.time()
+    while not stop_event.is_set():
+        # One YOLO call per batch; a frame interval and a bit is the longest
+        # worth waiting for the next frame of the batch
+        batch = _collect_batch(stop_event, adas.batch_size, frame_wait=0.05)
+        if not batch:
+            continue
         
+        batch_start = time.time()
         try:
-            with state.frame_lock:
-                if state.video_capture is None or not state.video_capture.isOpened():
-                    time.sleep(0.1)
-                    continue
-                
-                ret, frame = state.video_capture.read()
-                if not ret:
-                    if state.current_video_path:
-                        state.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                        ret, frame = state.video_capture.read()
-                        if not ret:
-                            time.sleep(0.1)
-                            continue
-                    else:
-                        time.sleep(0.033)
-                        continue
-                
-                # Process frame with enhanced ADAS
-                try:
-                    processed_frame = state.enhanced_adas.process_frame(frame)
-                except Exception as e:
-                    logger.warning(f"ADAS processing error: {e}")
-                    processed_frame = frame
-                
-                # Update statistics
-                state.stats['processed_frames'] += 1
-                elapsed = time.time() - state.stats['start_time']
-                if elapsed > 0:
-                    state.stats['current_fps'] = state.stats['processed_frames'] / elapsed
-                
-                # Track frame time
-                frame_time = time.time() - frame_start
-                frame_times.append(frame_time)
-                if len(frame_times) > 30:
-                    frame_times.pop(0)
-                state.stats['avg_frame_time'] = sum(frame_times) / len(frame_times) * 1000
-                
-                # Encode frame
-                ret, buffer = cv2.imencode('.jpg', processed_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if not ret:
-                    continue
-                
-                frame_bytes = buffer.tobytes()
+            # Stopping the pipeline cuts the in-flight frames short
+            processed_frames = adas.process_batch(batch, cancel_event=stop_event)
+        except Exception as e:
+            logger.warning(f"ADAS processing error: {e}")
+            processed_frames = batch
+        
+        try:
+            # Update statistics
+            state.stats['processed_frames'] += len(batch)
+            elapsed = time.time() - (state.stats['start_time'] or batch_start)
+            if elapsed > 0:
+                state.stats['current_fps'] = state.stats['processed_frames'] / elapsed
+            
+            # Track frame time
+            frame_times.append((time.time() - batch_start) / len(batch))
+            if len(frame_times) > 30:
+                frame_times.pop(0)
+            state.stats['avg_frame_time'] = sum(frame_times) / len(frame_times) * 1000
+        except Exception as e:
+            logger.error(f"Stats update error: {e}")
+            _record_error(e)
         
+        for processed_frame in processed_frames:
+            _hand_over(state.encode_q, processed_frame)
+
+
+def _encode_jpeg(frame, quality=JPEG_QUALITY):
+    """Encode a BGR frame to JPEG bytes, preferring libjpeg-turbo"""
+    if _tj is not None:
+        return _tj.encode(frame, quality=quality, pixel_format=TJPF_BGR,
+                          jpeg_subsample=TJSAMP_420)
+    
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ret:
+        return None
+    return buffer.tobytes()
+
+
+def _encode_loop(stop_event):
+    """JPEG-encode processed frames and publish them to the stream clients"""
+    while not stop_event.is_set():
+        try:
+            processed_frame = state.encode_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        
+        # The system lowers its stream quality when frames run over budget
+        adas = state.enhanced_adas
+        quality = adas.jpeg_quality if adas is not None else JPEG_QUALITY
+        try:
+            jpeg = _encode_jpeg(processed_frame, quality)
         except Exception as e:
-            logger.error(f"Frame generation error: {e}")
-            state.stats['errors'] += 1
-            state.stats['last_error'] = str(e)
-            time.sleep(0.1)
+            logger.error(f"Frame encode error: {e}")
+            _record_error(e)
             continue
+        if jpeg is not None:
+            _publish_frame(jpeg)
         
-        if frame_bytes:
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+        # Live stats go out from this thread, rate limited, so the infer
+        # stage never waits on socket writes
+        try:
+            _maybe_broadcast_stats()
+        except Exception as e:
+            logger.debug(f"Stats broadcast error: {e}")
+
+
+# Multipart framing around each JPEG in the /video_feed stream
+_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_PART_SUFFIX = b'\r\n'
+
+
+def generate_frames():
+    """
+    Stream the frames produced by the decode/infer/encode pipeline
+    
+    Each frame is encoded once and the same bytes go to every client; a
+    client that falls behind skips to the newest frame.
+    """
+    if state.enhanced_adas is None:
+        init_enhanced_adas()
+    
+    state.stats['start_time'] = time.time()
+    state.stats['processed_frames'] = 0
+    state.start_pipeline()
+    
+    seen = state.frame_seq
+    while state.processing_active:
+        with state.frame_cond:
+            if not state.frame_cond.wait_for(lambda: state.frame_seq != seen, timeout=1.0):
+                continue
+            seen = state.frame_seq
+            frame_bytes = state.latest_jpeg
+        if frame_bytes is None:
+            continue
         
-        time.sleep(0.033)
+        # Yield the pieces separately so the shared JPEG isn't copied into a
+        # new buffer for every client
+        yield _PART_HEADER
+        yield frame_bytes
+        yield _PART_SUFFIX
 
 
 # ============================================================================
@@ -190,13 +457,7 @@ def handle_disconnect():
 @socketio.on('request_stats')
 def handle_stats_request():
     """Send current stats to requesting client"""
-    emit('stats_update', {
-        'fps': round(state.stats['current_fps'], 2),
-        'frames': state.stats['processed_frames'],
-        'errors': state.stats['errors'],
-        'source': state.stats['source'],
-        'avg_time': round(state.stats['avg_frame_time'], 2)
-    })
+    emit('stats_update', _stats_payload())
 
 
 @socketio.on('start_webcam')
@@ -205,7 +466,8 @@ def handle_start_webcam():
     try:
         logger.info("Starting webcam...")
         state.processing_active = False
-        time.sleep(0.2)
+        # Joins the stage threads, so nothing touches the capture after this
+        state.stop_pipeline()
         
         with state.frame_lock:
             if state.video_capture is not None:
@@ -219,6 +481,8 @@ def handle_start_webcam():
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             cap.set(cv2.CAP_PROP_FPS, 30)
+            # Keep only the newest frame in the driver so reads are never stale
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             ret, test_frame = cap.read()
             if not ret:
@@ -233,6 +497,7 @@ def handle_start_webcam():
         state.stats['processed_frames'] = 0
         state.stats['source'] = 'webcam'
         state.processing_active = True
+        state.start_pipeline()
         
         emit('status_update', {'status': 'Webcam Active', 'source': 'webcam'}, broadcast=True)
         logger.info("Webcam started successfully")
@@ -243,27 +508,24 @@ def handle_start_webcam():
 
 
 @socketio.on('upload_video')
-def handle_upload_video(data):
-    """Handle video upload via WebSocket"""
+def handle_upload_notify(data):
+    """Start playing a video already uploaded through POST /api/upload"""
     try:
-        if 'filename' not in data or 'data' not in data:
+        if 'filename' not in data:
             emit('error', {'message': 'Invalid upload data'})
             return
         
         logger.info(f"Video upload request: {data['filename']}")
         
-        state.processing_active = False
-        time.sleep(0.2)
-        
-        os.makedirs(state.config_loader.config.get('upload_folder', 'uploads'), exist_ok=True)
         filename = secure_filename(data['filename'])
-        filepath = os.path.join('uploads', filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if not allowed_file(filename) or not os.path.isfile(filepath):
+            emit('error', {'message': 'Uploaded video not found'})
+            return
         
-        # Save file from base64 data
-        import base64
-        video_data = base64.b64decode(data['data'].split(',')[1])
-        with open(filepath, 'wb') as f:
-            f.write(video_data)
+        state.processing_active = False
+        # Joins the stage threads, so nothing touches the capture after this
+        state.stop_pipeline()
         
         # Verify and open video
         cap = cv2.VideoCapture(filepath)
@@ -285,6 +547,7 @@ def handle_upload_video(data):
         state.stats['processed_frames'] = 0
         state.stats['source'] = f'video: {filename}'
         state.processing_active = True
+        state.start_pipeline()
         
         emit('status_update', {
             'status': 'Video Playing',
@@ -305,7 +568,7 @@ def handle_stop_stream():
     try:
         logger.info("Stopping stream...")
         state.processing_active = False
-        time.sleep(0.1)
+        state.stop_pipeline()
         
         with state.frame_lock:
             if state.video_capture is not None:
@@ -336,6 +599,7 @@ def handle_update_config(data):
         if state.enhanced_adas is not None:
             overlay_config = state.config_loader.get_overlay_config()
             state.enhanced_adas.overlay_renderer.update_config(overlay_config)
+            state.enhanced_adas.refresh_config(state.config_loader)
         
         emit('config_updated', {'updated_keys': list(data.keys())}, broadcast=True)
         logger.info(f"Config updated: {list(data.keys())}")
@@ -349,24 +613,75 @@ def handle_update_config(data):
 # REST API ENDPOINTS (Fallback)
 # ============================================================================
 
+# Serialized responses of the polled endpoints: name -> (time, state key, body)
+_resp_cache = {}
+
+
+def _cached_json(name, ttl, build):
+    """
+    JSON response of build(), reused for ttl seconds
+    
+    A cached body is never served across a start/stop or a new error, since
+    those are part of its key.
+    """
+    key = (state.processing_active, state.stats['errors'], state.stats['source'])
+    now = time.monotonic()
+    entry = _resp_cache.get(name)
+    if entry is None or now - entry[0] >= ttl or entry[1] != key:
+        entry = (now, key, app.json.dumps(build()))
+        _resp_cache[name] = entry
+    return app.response_class(entry[2], mimetype='application/json')
+
+
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Get current system status"""
     try:
-        status_info = {
-            'processing': state.processing_active,
-            'video_loaded': state.video_capture is not None and state.video_capture.isOpened() if state.video_capture else False,
-            'adas_initialized': state.enhanced_adas is not None,
-            'stats': state.stats,
-            'connected_clients': len(state.connected_clients)
-        }
+        return _cached_json('status', STATUS_TTL, _build_status)
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+def _build_status():
+    """Payload of /api/status"""
+    status_info = {
+        'processing': state.processing_active,
+        'video_loaded': state.video_capture is not None and state.video_capture.isOpened() if state.video_capture else False,
+        'adas_initialized': state.enhanced_adas is not None,
+        'stats': state.stats,
+        'connected_clients': len(state.connected_clients)
+    }
+    
+    if state.enhanced_adas:
+        system_status = state.enhanced_adas.get_system_status()
+        status_info['system'] = system_status
+    
+    return {'status': 'success', 'data': status_info}
+
+
+@app.route('/api/upload', methods=['POST'])
+def upload_video():
+    """Save an uploaded video to disk; the client then starts it over the socket"""
+    try:
+        if 'video' not in request.files:
+            return jsonify({'status': 'error', 'message': 'No video file provided'}), 400
         
-        if state.enhanced_adas:
-            system_status = state.enhanced_adas.get_system_status()
-            status_info['system'] = system_status
+        file = request.files['video']
+        if not file.filename or not allowed_file(file.filename):
+            return jsonify({'status': 'error', 'message': 'Invalid file type. Supported: MP4, AVI, MOV, MKV, WEBM'}), 400
+        
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        filename = secure_filename(file.filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        
+        # Stream the upload to disk in 1 MiB chunks instead of buffering it
+        with open(filepath, 'wb', buffering=UPLOAD_CHUNK_SIZE) as f:
+            shutil.copyfileobj(file.stream, f, length=UPLOAD_CHUNK_SIZE)
         
-        return jsonify({'status': 'success', 'data': status_info})
+        logger.info(f"Video uploaded: {filename} ({os.path.getsize(filepath)} bytes)")
+        return jsonify({'status': 'success', 'filename': filename})
     except Exception as e:
+        logger.error(f"Upload error: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
@@ -411,24 +726,29 @@ def get_health():
 def get_system_info():
     """Get system information"""
     try:
-        info = {
-            'timestamp': datetime.now().isoformat(),
-            'version': '1.0.0-phase5-modern',
-            'components': {
-                'adas_initialized': state.enhanced_adas is not None,
-                'config_loaded': state.config_loader is not None,
-                'websocket_enabled': True
-            }
-        }
-        
-        if state.enhanced_adas:
-            info['adas_status'] = state.enhanced_adas.get_system_status()
-        
-        return jsonify({'status': 'success', 'info': info})
+        return _cached_json('system_info', SYSTEM_INFO_TTL, _build_system_info)
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+def _build_system_info():
+    """Payload of /api/system/info"""
+    info = {
+        'timestamp': datetime.now().isoformat(),
+        'version': '1.0.0-phase5-modern',
+        'components': {
+            'adas_initialized': state.enhanced_adas is not None,
+            'config_loaded': state.config_loader is not None,
+            'websocket_enabled': True
+        }
+    }
+    
+    if state.enhanced_adas:
+        info['adas_status'] = state.enhanced_adas.get_system_status()
+    
+    return {'status': 'success', 'info': info}
+
+
 # ============================================================================
 # Error Handlers
 # ============================================================================
@@ -452,7 +772,7 @@ def internal_error(error):
 
 if __name__ == '__main__':
     # Create necessary directories
-    os.makedirs('uploads', exist_ok=True)
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
     # Initialize Enhanced ADAS system
     init_enhanced_adas()
@@ -464,5 +784,5 @@ if __name__ == '__main__':
     logger.info("WebSocket support enabled for real-time updates")
     logger.info("="*70)
     
-    # Run Flask app with SocketIO
-    socketio.run(app, host='0.0.0.0', port=5000, debug=False)
+    # Development server; see wsgi.py for serving under gunicorn
+    socketio.run(app, host='0.0.0.0', port=5000)
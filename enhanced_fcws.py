@@ -8,6 +8,7 @@ import numpy as np
 import logging
 from typing import List, Dict, Tuple, Optional, Any
 
+from fcws import CRITICAL_TINT
 from utils.distance_estimator import DistanceEstimator, DistanceEstimation
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,16 @@ class EnhancedFCWS:
         self.critical_distance = critical_distance
         self.warning_state = "SAFE"  # SAFE, WARNING, CRITICAL
         
+        # Warning banners use constant strings/fonts, so measure them once
+        self._critical_text_size = cv2.getTextSize(
+            "CRITICAL: BRAKE NOW!", cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
+        self._warning_text_size = cv2.getTextSize(
+            "WARNING: Vehicle Ahead", cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
+        self._label_size_cache: Dict[str, Tuple[int, int]] = {}
+        
+        # Object classes that can be a collision risk
+        self._vehicle_classes = frozenset(['car', 'truck', 'bus', 'motorcycle', 'person'])
+        
         # Use provided distance estimator or create new one
         self.distance_estimator = distance_estimator or DistanceEstimator()
         
@@ -51,34 +62,24 @@ class EnhancedFCWS:
             Tuple of (warning_state, risky_detections)
         """
         height, width = frame.shape[:2]
-        risky_detections = []
         
         # Filter detections in the forward path (center region)
         forward_zone_left = width * 0.2
         forward_zone_right = width * 0.8
         
-        for det in detections:
-            center_x = det['center'][0]
-            
-            # Check if object is in forward path
-            if forward_zone_left < center_x < forward_zone_right:
-                # Check if object is a vehicle (higher priority)
-                if det['class'] in ['car', 'truck', 'bus', 'motorcycle', 'person']:
-                    # Estimate distance using enhanced estimator
-                    bbox = det['bbox']
-                    object_class = det['class']
-                    detection_conf = det.get('confidence', 1.0)
-                    
-                    distance_est = self.distance_estimator.estimate_distance(
-                        bbox, height, object_class, detection_conf
-                    )
-                    
-                    # Store distance estimation
-                    det['distance_estimation'] = distance_est
-                    det['distance'] = distance_est.distance_meters if distance_est.distance_meters else distance_est.distance_pixels
-                    det['distance_confidence'] = distance_est.confidence
-                    
-                    risky_detections.append(det)
+        # Relevant classes (a set lookup) in the forward path
+        vehicle_classes = self._vehicle_classes
+        risky_detections = [det for det in detections
+                            if det['class'] in vehicle_classes
+                            and forward_zone_left < det['center'][0] < forward_zone_right]
+        
+        # Estimate distances for all forward objects in one batched call
+        estimates = self.distance_estimator.estimate_distances_batch(risky_detections, height)
+        for det, distance_est in zip(risky_detections, estimates):
+            # Store distance estimation
+            det['distance_estimation'] = distance_est
+            det['distance'] = distance_est.distance_meters if distance_est.distance_meters else distance_est.distance_pixels
+            det['distance_confidence'] = distance_est.confidence
         
         # Sort by distance (closest first)
         risky_detections.sort(key=lambda x: x.get('distance', float('inf')))
@@ -124,14 +125,12 @@ class EnhancedFCWS:
         
         # Draw warning overlay
         if self.warning_state == "CRITICAL":
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, 0), (width, height), (0, 0, 255), -1)
-            cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+            # 30% red tint in a single in-place pass over the frame
+            cv2.transform(frame, CRITICAL_TINT, dst=frame)
             
             # Critical warning text
             text = "CRITICAL: BRAKE NOW!"
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
-            text_x = (width - text_size[0]) // 2
+            text_x = (width - self._critical_text_size[0]) // 2
             text_y = height // 2
             cv2.putText(frame, text, (text_x, text_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
@@ -139,8 +138,7 @@ class EnhancedFCWS:
         elif self.warning_state == "WARNING":
             # Warning text
             text = "WARNING: Vehicle Ahead"
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-            text_x = (width - text_size[0]) // 2
+            text_x = (width - self._warning_text_size[0]) // 2
             text_y = 50
             cv2.putText(frame, text, (text_x, text_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 165, 255), 2)
@@ -171,7 +169,7 @@ class EnhancedFCWS:
                     color = (0, 255, 255)  # Yellow for others
                 
                 # Draw distance text with background
-                text_size = cv2.getTextSize(dist_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+                text_size = self._label_size(dist_text)
                 bg_x1 = x1
                 bg_y1 = y1 - text_size[1] - 25
                 bg_x2 = x1 + text_size[0] + 10
@@ -198,6 +196,24 @@ class EnhancedFCWS:
         
         return frame
     
+    def _label_size(self, text: str) -> Tuple[int, int]:
+        """
+        Measure a distance label, memoized on the label string
+        
+        Args:
+            text: Label text drawn at scale 0.6, thickness 2
+            
+        Returns:
+            (width, height) of the rendered text
+        """
+        size = self._label_size_cache.get(text)
+        if size is None:
+            if len(self._label_size_cache) >= 256:
+                self._label_size_cache.clear()
+            size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            self._label_size_cache[text] = size
+        return size
+    
     def set_distance_thresholds(self, warning_distance: float, critical_distance: float):
         """
         Update distance thresholds
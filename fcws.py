@@ -7,6 +7,11 @@ import cv2
 import numpy as np
 from typing import List, Dict, Tuple
 
+# Per-pixel affine map blending 30% red into a BGR frame: 0.7 * bgr + 0.3 * (0, 0, 255)
+CRITICAL_TINT = np.array([[0.7, 0.0, 0.0, 0.0],
+                          [0.0, 0.7, 0.0, 0.0],
+                          [0.0, 0.0, 0.7, 0.3 * 255]])
+
 
 class FCWS:
     """Forward Collision Warning System"""
@@ -22,6 +27,12 @@ class FCWS:
         self.warning_distance = warning_distance
         self.critical_distance = critical_distance
         self.warning_state = "SAFE"  # SAFE, WARNING, CRITICAL
+        
+        # Warning banners use constant strings/fonts, so measure them once
+        self._critical_text_size = cv2.getTextSize(
+            "CRITICAL: BRAKE NOW!", cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
+        self._warning_text_size = cv2.getTextSize(
+            "WARNING: Vehicle Ahead", cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
     
     def calculate_distance(self, detection: Dict, frame_height: int) -> float:
         """
@@ -124,14 +135,12 @@ class FCWS:
         
         # Draw warning overlay
         if self.warning_state == "CRITICAL":
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, 0), (width, height), (0, 0, 255), -1)
-            cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+            # 30% red tint in a single in-place pass over the frame
+            cv2.transform(frame, CRITICAL_TINT, dst=frame)
             
             # Critical warning text
             text = "CRITICAL: BRAKE NOW!"
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
-            text_x = (width - text_size[0]) // 2
+            text_x = (width - self._critical_text_size[0]) // 2
             text_y = height // 2
             cv2.putText(frame, text, (text_x, text_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
@@ -139,8 +148,7 @@ class FCWS:
         elif self.warning_state == "WARNING":
             # Warning text
             text = "WARNING: Vehicle Ahead"
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-            text_x = (width - text_size[0]) // 2
+            text_x = (width - self._warning_text_size[0]) // 2
             text_y = 50
             cv2.putText(frame, text, (text_x, text_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 165, 255), 2)
@@ -5,15 +5,22 @@ Detects lane markings using computer vision techniques
 
 import cv2
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Tuple, Optional
 
 
 class LaneDetector:
     """Lane detection using traditional CV methods (can be replaced with deep learning)"""
     
-    def __init__(self):
-        """Initialize lane detector"""
-        pass
+    def __init__(self, use_opencl: bool = False):
+        """
+        Initialize lane detector
+        
+        Args:
+            use_opencl: Run the edge/ROI preprocessing through OpenCV's OpenCL (UMat) path
+        """
+        self.use_opencl = use_opencl
+        # ROI masks by (height, width); the polygon only depends on the frame size
+        self._roi_mask_cache = {}
     
     def detect_lanes(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], np.ndarray]:
         """
@@ -25,8 +32,13 @@ class LaneDetector:
         Returns:
             Tuple of (left_lane_points, right_lane_points, processed_frame)
         """
+        height, width = frame.shape[:2]
+        
+        # With OpenCL the preprocessing chain stays on the device until Hough
+        src = cv2.UMat(frame) if self.use_opencl else frame
+        
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
         
         # Apply Gaussian blur
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
@@ -34,17 +46,10 @@ class LaneDetector:
         # Apply Canny edge detection
         edges = cv2.Canny(blurred, 50, 150)
         
-        # Create region of interest (lower half of image)
-        height, width = edges.shape
-        mask = np.zeros_like(edges)
-        roi_vertices = np.array([[
-            (width * 0.1, height),
-            (width * 0.45, height * 0.6),
-            (width * 0.55, height * 0.6),
-            (width * 0.9, height)
-        ]], dtype=np.int32)
-        cv2.fillPoly(mask, roi_vertices, 255)
-        masked_edges = cv2.bitwise_and(edges, mask)
+        # Restrict to the region of interest (lower half of image)
+        masked_edges = cv2.bitwise_and(edges, self._roi_mask(height, width))
+        if self.use_opencl:
+            masked_edges = masked_edges.get()
         
         # Apply Hough Transform to detect lines
         lines = cv2.HoughLinesP(masked_edges, rho=1, theta=np.pi/180, 
@@ -63,6 +68,33 @@ class LaneDetector:
         
         return left_lane, right_lane, processed_frame
     
+    def _roi_mask(self, height: int, width: int):
+        """
+        Get the region-of-interest mask for a frame size, building it on first use
+        
+        Args:
+            height: Frame height
+            width: Frame width
+            
+        Returns:
+            uint8 mask (a UMat when using OpenCL)
+        """
+        key = (height, width)
+        mask = self._roi_mask_cache.get(key)
+        if mask is None:
+            mask = np.zeros((height, width), dtype=np.uint8)
+            roi_vertices = np.array([[
+                (width * 0.1, height),
+                (width * 0.45, height * 0.6),
+                (width * 0.55, height * 0.6),
+                (width * 0.9, height)
+            ]], dtype=np.int32)
+            cv2.fillPoly(mask, roi_vertices, 255)
+            if self.use_opencl:
+                mask = cv2.UMat(mask)
+            self._roi_mask_cache[key] = mask
+        return mask
+    
     def _separate_lanes(self, lines: Optional[np.ndarray], width: int, height: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """
         Separate detected lines into left and right lanes
@@ -78,70 +110,50 @@ class LaneDetector:
         if lines is None:
             return None, None
         
-        left_lines = []
-        right_lines = []
+        # All segments as one (N, 4) array of x1, y1, x2, y2
+        segments = lines.reshape(-1, 4).astype(np.float64)
+        dx = segments[:, 2] - segments[:, 0]
+        keep = dx != 0
+        segments = segments[keep]
+        slopes = (segments[:, 3] - segments[:, 1]) / dx[keep]
         
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            
-            # Calculate slope
-            if x2 - x1 == 0:
-                continue
-            slope = (y2 - y1) / (x2 - x1)
-            
-            # Filter by slope (lanes should have significant slope)
-            if abs(slope) < 0.3:
-                continue
-            
-            # Separate left and right lanes
-            if slope < 0:  # Left lane (negative slope)
-                left_lines.append(line[0])
-            else:  # Right lane (positive slope)
-                right_lines.append(line[0])
-        
-        # Average left lane
-        left_lane = None
-        if left_lines:
-            left_lane = self._average_lines(left_lines, height)
-        
-        # Average right lane
-        right_lane = None
-        if right_lines:
-            right_lane = self._average_lines(right_lines, height)
+        # Filter by slope (lanes should have significant slope), then split
+        # by sign: left lane negative, right lane positive
+        steep = np.abs(slopes) >= 0.3
+        left = steep & (slopes < 0)
+        right = steep & (slopes >= 0)
+        
+        left_lane = self._average_lines(segments[left], height, slopes[left])
+        right_lane = self._average_lines(segments[right], height, slopes[right])
         
         return left_lane, right_lane
     
-    def _average_lines(self, lines: List, height: int) -> np.ndarray:
+    def _average_lines(self, lines: np.ndarray, height: int,
+                       slopes: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Average multiple lines into a single line
         
         Args:
-            lines: List of line coordinates
+            lines: Line coordinates, shape (N, 4)
             height: Frame height
+            slopes: Precomputed slope of each line (computed if None)
             
         Returns:
             Averaged line coordinates
         """
-        if not lines:
-            return None
+        lines = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+        if slopes is None:
+            dx = lines[:, 2] - lines[:, 0]
+            lines = lines[dx != 0]
+            slopes = (lines[:, 3] - lines[:, 1]) / dx[dx != 0]
         
-        # Calculate average slope and intercept
-        slopes = []
-        intercepts = []
-        
-        for x1, y1, x2, y2 in lines:
-            if x2 - x1 == 0:
-                continue
-            slope = (y2 - y1) / (x2 - x1)
-            intercept = y1 - slope * x1
-            slopes.append(slope)
-            intercepts.append(intercept)
-        
-        if not slopes:
+        if len(slopes) == 0:
             return None
         
-        avg_slope = np.mean(slopes)
-        avg_intercept = np.mean(intercepts)
+        # Calculate average slope and intercept
+        intercepts = lines[:, 1] - slopes * lines[:, 0]
+        avg_slope = slopes.mean()
+        avg_intercept = intercepts.mean()
         
         # Calculate line endpoints
         y1 = height
@@ -5,6 +5,7 @@ Integrates LDWS, LKAS, and FCWS using YOLOv8
 
 import cv2
 import argparse
+import os
 import sys
 from object_detector import ObjectDetector
 from lane_detector import LaneDetector
@@ -27,7 +28,11 @@ class ADASSystem:
         print("Initializing ADAS System...")
         print("Loading YOLOv8 model...")
         self.object_detector = ObjectDetector(yolo_model, conf_threshold)
-        self.lane_detector = LaneDetector()
+        # OpenCL preprocessing is opt-in; some drivers are slower than the CPU
+        use_opencl = os.environ.get('ADAS_OPENCL') == '1' and cv2.ocl.haveOpenCL()
+        if use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        self.lane_detector = LaneDetector(use_opencl=use_opencl)
         self.fcws = FCWS(warning_distance=150.0, critical_distance=80.0)
         self.ldws = LDWS(departure_threshold=30.0)
         self.lkas = LKAS(assist_threshold=20.0)
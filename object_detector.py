@@ -3,10 +3,11 @@ YOLOv8 Object Detection Module for ADAS
 Detects vehicles, pedestrians, and other obstacles
 """
 
+import os
 import cv2
 import numpy as np
 from ultralytics import YOLO
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 
 class ObjectDetector:
@@ -17,10 +18,13 @@ class ObjectDetector:
         Initialize the object detector
         
         Args:
-            model_path: Path to YOLOv8 model weights
+            model_path: Path to YOLOv8 model weights (.pt), or an exported .onnx
+                model which runs on ONNX Runtime (CUDA when available)
             conf_threshold: Confidence threshold for detections
         """
-        self.model = YOLO(model_path)
+        # Exported models carry no task metadata for YOLO to infer it from
+        task = 'detect' if model_path.endswith('.onnx') else None
+        self.model = YOLO(model_path, task=task)
         self.conf_threshold = conf_threshold
         # COCO classes relevant for ADAS (vehicles, pedestrians, etc.)
         self.relevant_classes = {
@@ -28,6 +32,43 @@ class ObjectDetector:
             5: 'bus', 7: 'truck'
         }
     
+    @staticmethod
+    def export_onnx(model_path: str = 'yolov8n.pt', half: Optional[bool] = None,
+                    dynamic: bool = True) -> str:
+        """
+        Export YOLOv8 weights to ONNX next to the .pt file
+        
+        Args:
+            model_path: Path to YOLOv8 model weights
+            half: Export FP16 weights, which needs a CUDA device at export time
+                and one to run on (default: only when CUDA is available)
+            dynamic: Export with a dynamic batch axis, for detect_batch
+            
+        Returns:
+            Path to the exported .onnx model
+        """
+        if half is None:
+            import torch
+            half = torch.cuda.is_available()
+        return YOLO(model_path).export(format='onnx', half=half, dynamic=dynamic,
+                                       device=0 if half else 'cpu')
+    
+    @staticmethod
+    def resolve_model_path(model_path: str) -> str:
+        """
+        Prefer an exported ONNX model over the .pt weights it was exported from
+        
+        Args:
+            model_path: Path to YOLOv8 model weights
+            
+        Returns:
+            The sibling .onnx path if it exists, else model_path
+        """
+        root, ext = os.path.splitext(model_path)
+        if ext == '.pt' and os.path.exists(root + '.onnx'):
+            return root + '.onnx'
+        return model_path
+    
     def detect(self, frame: np.ndarray) -> List[Dict]:
         """
         Detect objects in the frame
@@ -42,21 +83,44 @@ class ObjectDetector:
         detections = []
         
         for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                cls_id = int(box.cls[0])
-                if cls_id in self.relevant_classes:
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    confidence = float(box.conf[0])
-                    
-                    detections.append({
-                        'class': self.relevant_classes[cls_id],
-                        'class_id': cls_id,
-                        'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                        'confidence': confidence,
-                        'center': [int((x1 + x2) / 2), int((y1 + y2) / 2)],
-                        'area': int((x2 - x1) * (y2 - y1))
-                    })
+            detections.extend(self._parse_result(result))
+        
+        return detections
+    
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Detect objects in several frames with a single model call
+        
+        Args:
+            frames: List of input frames (BGR format)
+            
+        Returns:
+            One detection list per input frame, in the same order
+        """
+        if not frames:
+            return []
+        
+        results = self.model(frames, conf=self.conf_threshold, verbose=False)
+        return [self._parse_result(result) for result in results]
+    
+    def _parse_result(self, result) -> List[Dict]:
+        """Convert one YOLO result into ADAS detection dicts"""
+        detections = []
+        
+        for box in result.boxes:
+            cls_id = int(box.cls[0])
+            if cls_id in self.relevant_classes:
+                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+                confidence = float(box.conf[0])
+                
+                detections.append({
+                    'class': self.relevant_classes[cls_id],
+                    'class_id': cls_id,
+                    'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                    'confidence': confidence,
+                    'center': [int((x1 + x2) / 2), int((y1 + y2) / 2)],
+                    'area': int((x2 - x1) * (y2 - y1))
+                })
         
         return detections
     
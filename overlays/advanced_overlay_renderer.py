@@ -37,6 +37,10 @@ class AdvancedOverlayRenderer:
         # Previous frame for transitions
         self.previous_frame = None
         
+        # Lane polygon blend weights, reused while the lanes and config don't change
+        self._polygon_key = None
+        self._polygon_blend = None
+        
         logger.info("Advanced Overlay Renderer initialized")
     
     def alpha_blend(self, foreground: np.ndarray, background: np.ndarray, 
@@ -95,44 +99,79 @@ class AdvancedOverlayRenderer:
         height, width = frame.shape[:2]
         
         try:
-            # Convert lanes to points if needed
-            left_points = self._lane_to_points(left_lane, height)
-            right_points = self._lane_to_points(right_lane, height)
+            # Lanes are often unchanged between frames (e.g. the hybrid detector
+            # holding its last result), so the weights are only rebuilt on change
+            key = (frame.shape, np.asarray(left_lane).tobytes(), np.asarray(right_lane).tobytes(),
+                   self.config.lane_polygon_color, self.config.lane_polygon_alpha,
+                   self.config.gradient_enabled)
+            if key != self._polygon_key:
+                self._polygon_blend = self._build_polygon_blend(left_lane, right_lane, height, width)
+                self._polygon_key = key
             
-            if left_points is None or right_points is None:
+            if self._polygon_blend is None:
                 return frame
             
-            # Create polygon points (left bottom to top, right top to bottom)
-            polygon_points = np.vstack([left_points, right_points[::-1]])
-            polygon_points = polygon_points.astype(np.int32)
-            
-            # Create overlay
-            overlay = frame.copy()
-            
-            # Draw filled polygon
-            cv2.fillPoly(overlay, [polygon_points], self.config.lane_polygon_color)
-            
-            # Apply gradient if enabled
-            if self.config.gradient_enabled:
-                # Create gradient mask
-                mask = self.create_gradient_mask(height, width, 
-                                                start_alpha=self.config.lane_polygon_alpha,
-                                                end_alpha=self.config.lane_polygon_alpha * 0.3)
-                
-                # Apply mask to overlay
-                for c in range(3):
-                    overlay[:, :, c] = overlay[:, :, c] * mask + frame[:, :, c] * (1 - mask)
-                
-                frame = overlay.astype(np.uint8)
-            else:
-                # Simple alpha blend
-                frame = self.alpha_blend(overlay, frame, self.config.lane_polygon_alpha)
+            # Blend the polygon colour in, only inside its bounding box
+            (y0, y1, x0, x1), color, frame_weight, color_weight = self._polygon_blend
+            roi = frame[y0:y1, x0:x1]
+            roi[:] = cv2.blendLinear(roi, color, frame_weight, color_weight)
             
         except Exception as e:
             logger.warning(f"Error drawing lane polygon: {e}")
         
         return frame
     
+    def _build_polygon_blend(self, left_lane: np.ndarray, right_lane: np.ndarray,
+                             height: int, width: int) -> Optional[Tuple]:
+        """
+        Precompute the per-pixel blend weights of the lane polygon
+        
+        Args:
+            left_lane: Left lane line [x1, y1, x2, y2] or points
+            right_lane: Right lane line [x1, y1, x2, y2] or points
+            height: Frame height
+            width: Frame width
+            
+        Returns:
+            ((y0, y1, x0, x1), colour image, frame weights, colour weights) for the
+            polygon's bounding box, or None if there is nothing to draw
+        """
+        # Convert lanes to points if needed
+        left_points = self._lane_to_points(left_lane, height)
+        right_points = self._lane_to_points(right_lane, height)
+        
+        if left_points is None or right_points is None:
+            return None
+        
+        # Create polygon points (left bottom to top, right top to bottom)
+        polygon_points = np.vstack([left_points, right_points[::-1]])
+        polygon_points = polygon_points.astype(np.int32)
+        
+        # Bounding box of the polygon, clipped to the frame
+        x, y, w, h = cv2.boundingRect(polygon_points)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, width), min(y + h, height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        
+        # Colour weight: the polygon alpha inside the polygon, 0 outside
+        color_weight = np.zeros((y1 - y0, x1 - x0), dtype=np.float32)
+        cv2.fillPoly(color_weight, [polygon_points - np.array([x0, y0], dtype=np.int32)], 1.0)
+        
+        if self.config.gradient_enabled:
+            # Vertical gradient over the full frame height, opaque at the bottom
+            gradient = self.create_gradient_mask(height, 1,
+                                                 start_alpha=self.config.lane_polygon_alpha,
+                                                 end_alpha=self.config.lane_polygon_alpha * 0.3)
+            color_weight *= gradient[y0:y1]
+        else:
+            color_weight *= np.clip(self.config.lane_polygon_alpha, 0.0, 1.0)
+        
+        color = np.empty((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        color[:] = self.config.lane_polygon_color
+        
+        return (y0, y1, x0, x1), color, 1.0 - color_weight, color_weight
+    
     def _lane_to_points(self, lane: np.ndarray, frame_height: int, 
                        num_points: int = 50) -> Optional[np.ndarray]:
         """
@@ -160,10 +199,17 @@ class AdvancedOverlayRenderer:
                     return np.column_stack((x_values, y_values))
                 
                 elif len(lane) <= 3:
-                    # Polynomial coefficients
-                    y_values = np.linspace(frame_height, frame_height * 0.6, num_points)
-                    x_values = np.polyval(lane, y_values)
-                    return np.column_stack((x_values, y_values))
+                    # Polynomial coefficients, evaluated with in-place Horner
+                    # steps straight into the point columns
+                    points = np.empty((num_points, 2))
+                    y_values = points[:, 1]
+                    x_values = points[:, 0]
+                    y_values[:] = np.linspace(frame_height, frame_height * 0.6, num_points)
+                    x_values.fill(lane[0])
+                    for coeff in lane[1:]:
+                        x_values *= y_values
+                        x_values += coeff
+                    return points
             
             elif lane.ndim == 2 and lane.shape[1] == 2:
                 # Already points
@@ -188,8 +188,14 @@ async function uploadVideo(input) {
         const data = await response.json();
         
         if (data.status === 'success') {
-            showToast('success', 'Video Uploaded', `${data.filename} - ${data.frames} frames @ ${data.resolution}`);
-            showVideoStream();
+            // The server opens the video in the background; wait until it is ready
+            const job = await waitForUploadJob(data.job_id);
+            if (job.state === 'ready') {
+                showToast('success', 'Video Uploaded', `${data.filename} - ${job.frames} frames @ ${job.resolution}`);
+                showVideoStream();
+            } else {
+                showToast('error', 'Upload Error', job.message || 'Failed to open video file');
+            }
         } else {
             showToast('error', 'Upload Error', data.message);
         }
@@ -200,6 +206,20 @@ async function uploadVideo(input) {
     input.value = '';
 }
 
+async function waitForUploadJob(jobId) {
+    for (let attempt = 0; attempt < 120; attempt++) {
+        const response = await fetch(`/api/status?job=${jobId}`);
+        const data = await response.json();
+        const job = data.data && data.data.upload_job;
+        
+        if (job && job.state !== 'pending') {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
+    return { state: 'error', message: 'Timed out waiting for video' };
+}
+
 async function stopVideo() {
     try {
         const response = await fetch('/api/video/stop', { method: 'POST' });
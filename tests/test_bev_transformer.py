@@ -50,6 +50,33 @@ class TestBirdEyeViewTransformer(unittest.TestCase):
         self.assertIsNotNone(bev_frame)
         self.assertEqual(bev_frame.shape[:2], (400, 300))
     
+    def test_transform_frame_matches_warp_perspective(self):
+        """Test the precomputed remap matches a direct perspective warp"""
+        self.transformer.set_default_points(self.frame_width, self.frame_height)
+        x = np.linspace(0, 255, self.frame_width, dtype=np.float32)
+        y = np.linspace(0, 255, self.frame_height, dtype=np.float32)
+        gradient = ((x[np.newaxis, :] + y[:, np.newaxis]) / 2).astype(np.uint8)
+        frame = np.dstack([gradient] * 3)
+        
+        bev_frame = self.transformer.transform_frame(frame)
+        expected = cv2.warpPerspective(frame, self.transformer.M, (300, 400), flags=cv2.INTER_LINEAR)
+        
+        diff = np.abs(bev_frame.astype(int) - expected)
+        self.assertLessEqual(diff.max(), 2)
+    
+    def test_transform_frame_opencl_matches_cpu(self):
+        """Test the UMat warp gives the same BEV image as the CPU path"""
+        frame = np.random.randint(0, 256, (480, 640, 3), dtype=np.uint8)
+        self.transformer.set_default_points(640, 480)
+        opencl = BirdEyeViewTransformer(output_size=(300, 400), use_opencl=True)
+        opencl.set_default_points(640, 480)
+        
+        bev_frame = opencl.transform_frame(frame)
+        
+        self.assertIsInstance(bev_frame, np.ndarray)
+        diff = np.abs(bev_frame.astype(int) - self.transformer.transform_frame(frame))
+        self.assertLessEqual(diff.max(), 1)
+    
     def test_transform_lanes(self):
         """Test lane transformation"""
         self.transformer.set_default_points(self.frame_width, self.frame_height)
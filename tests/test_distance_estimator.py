@@ -68,6 +68,49 @@ class TestDistanceEstimator(unittest.TestCase):
         for result in results:
             self.assertIsInstance(result, DistanceEstimation)
     
+    def test_batch_matches_single_estimates(self):
+        """Test the compiled batch path gives estimate_distance's results"""
+        detections = [
+            {'bbox': [100, 100, 200, 300], 'class': 'car', 'confidence': 0.9},
+            {'bbox': [300, 150, 400, 350], 'class': 'truck', 'confidence': 0.85},
+            {'bbox': [500, 200, 900, 260], 'class': 'unknown', 'confidence': 0.8},
+            {'bbox': [10, 10, 12, 11], 'class': 'person'},
+            {'bbox': [0, 0, 1000, 1000], 'class': 'bus', 'confidence': 0.7}
+        ]
+        calibrated = DistanceEstimator()
+        calibrated.has_calibration = True
+        calibrated.focal_length = 1000.0
+        
+        for estimator in (self.estimator, calibrated):
+            results = estimator.estimate_distances_batch(detections, 1080)
+            for det, result in zip(detections, results):
+                expected = estimator.estimate_distance(det['bbox'], 1080, det['class'],
+                                                       det.get('confidence', 1.0))
+                self.assertEqual(result.method, expected.method)
+                self.assertEqual(result.has_calibration, expected.has_calibration)
+                if expected.distance_meters is None:
+                    self.assertIsNone(result.distance_meters)
+                else:
+                    self.assertAlmostEqual(result.distance_meters, expected.distance_meters)
+                self.assertAlmostEqual(result.distance_pixels, expected.distance_pixels)
+                self.assertAlmostEqual(result.confidence, expected.confidence)
+                np.testing.assert_allclose(result.confidence_interval, expected.confidence_interval)
+        
+        self.assertEqual(self.estimator.estimate_distances_batch([], 1080), [])
+    
+    def test_estimate_batch_arrays(self):
+        """Test the array entry point matches the detection-dict batch"""
+        detections = [
+            {'bbox': [100, 100, 200, 300], 'class': 'car', 'confidence': 0.9},
+            {'bbox': [300, 150, 400, 350], 'class': 'truck', 'confidence': 0.85}
+        ]
+        bboxes = np.array([det['bbox'] for det in detections], dtype=np.float32)
+        
+        results = self.estimator.estimate_batch(bboxes, 1080, ['car', 'truck'], [0.9, 0.85])
+        
+        self.assertEqual(results, self.estimator.estimate_distances_batch(detections, 1080))
+        self.assertEqual(self.estimator.estimate_batch(np.empty((0, 4)), 1080, []), [])
+    
     def test_default_object_heights(self):
         """Test default object heights"""
         heights = self.estimator.object_heights
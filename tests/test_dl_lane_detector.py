@@ -0,0 +1,121 @@
+"""
+Unit tests for DLLaneDetector preprocessing
+"""
+
+import unittest
+import cv2
+import numpy as np
+from dl_models.dl_lane_detector import DLLaneDetector
+
+
+class _StubDetector(DLLaneDetector):
+    """Minimal concrete detector for exercising the base class"""
+    
+    def load_model(self):
+        return False
+    
+    def detect_lanes(self, frame):
+        return None
+    
+    def postprocess_output(self, model_output, original_shape):
+        return {}
+
+
+class TestDLLaneDetector(unittest.TestCase):
+    """Test DLLaneDetector base class helpers"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.detector = _StubDetector('model.onnx', 'onnx', 'cpu', input_size=(288, 800))
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 255, size=(720, 1280, 3), dtype=np.uint8)
+    
+    def test_preprocess_frame_shape(self):
+        """Test preprocessed tensor is NCHW float32"""
+        tensor = self.detector.preprocess_frame(self.frame)
+        
+        self.assertEqual(tensor.shape, (1, 3, 288, 800))
+        self.assertEqual(tensor.dtype, np.float32)
+    
+    def test_preprocess_frame_matches_reference(self):
+        """Test preprocessing matches resize -> RGB -> /255 -> CHW"""
+        resized = cv2.resize(self.frame, (800, 288))
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+        expected = np.transpose(rgb.astype(np.float32) / 255.0, (2, 0, 1))[np.newaxis]
+        
+        tensor = self.detector.preprocess_frame(self.frame)
+        
+        np.testing.assert_allclose(tensor, expected, atol=1e-6)
+    
+    def test_preprocess_frame_nhwc(self):
+        """Test channels-last preprocessing matches the NCHW tensor transposed"""
+        expected = np.transpose(self.detector.preprocess_frame(self.frame), (0, 2, 3, 1))
+        self.detector.input_layout = 'nhwc'
+        
+        tensor = self.detector.preprocess_frame(self.frame)
+        
+        self.assertEqual(tensor.shape, (1, 288, 800, 3))
+        self.assertTrue(tensor.flags['C_CONTIGUOUS'])
+        np.testing.assert_allclose(tensor, expected, atol=1e-6)
+    
+    def test_preprocess_frame_returns_fresh_tensor(self):
+        """Test consecutive calls don't share output tensors"""
+        first = self.detector.preprocess_frame(self.frame)
+        second = self.detector.preprocess_frame(np.zeros_like(self.frame))
+        
+        self.assertGreater(first.max(), 0)
+        self.assertEqual(second.max(), 0)
+    
+    def test_preprocess_frame_into_buffer(self):
+        """Test preprocessing into a caller buffer matches a fresh tensor for both layouts"""
+        for layout, shape in (('nchw', (1, 3, 288, 800)), ('nhwc', (1, 288, 800, 3))):
+            self.detector.input_layout = layout
+            expected = self.detector.preprocess_frame(self.frame)
+            buf = np.zeros(shape, dtype=np.float32)
+            
+            result = self.detector.preprocess_frame(self.frame, out=buf)
+            
+            self.assertIs(result, buf)
+            np.testing.assert_allclose(buf, expected, atol=1e-6)
+
+    
+    def test_scale_lanes_to_original(self):
+        """Test points and lines are scaled to the original frame size"""
+        points = np.array([[400.0, 144.0], [800.0, 288.0]], dtype=np.float32)
+        line = np.array([400, 144, 800, 288])
+        
+        scaled = self.detector.scale_lanes_to_original(
+            {'left': points, 'line': line, 'confidence': 0.9}, (720, 1280)
+        )
+        
+        np.testing.assert_allclose(scaled['left'], [[640.0, 360.0], [1280.0, 720.0]])
+        self.assertEqual(scaled['left'].dtype, np.float32)
+        np.testing.assert_array_equal(scaled['line'], [640, 360, 1280, 720])
+        self.assertEqual(scaled['confidence'], 0.9)
+        # Inputs are left untouched
+        self.assertEqual(points[1, 0], 800.0)
+    
+    def test_scale_points_to_original(self):
+        """Test direct point scaling keeps the input dtype"""
+        points = np.array([[400.0, 144.0], [800.0, 288.0]], dtype=np.float32)
+        int_points = np.array([[400, 144], [800, 288]])
+        
+        scaled = self.detector.scale_points_to_original(points, (720, 1280))
+        scaled_int = self.detector.scale_points_to_original(int_points, (720, 1280))
+        
+        np.testing.assert_allclose(scaled, [[640.0, 360.0], [1280.0, 720.0]])
+        self.assertEqual(scaled.dtype, np.float32)
+        np.testing.assert_array_equal(scaled_int, [[640, 360], [1280, 720]])
+        self.assertEqual(scaled_int.dtype, int_points.dtype)
+    
+    def test_calculate_lane_curvature(self):
+        """Test curvature radius of a parabola and of a straight lane"""
+        self.assertAlmostEqual(self.detector.calculate_lane_curvature(np.array([0.5, 0.0, 0.0]), 0.0), 1.0)
+        self.assertEqual(self.detector.calculate_lane_curvature(np.array([0.0, 1.0, 0.0]), 10.0),
+                         float('inf'))
+        self.assertEqual(self.detector.calculate_lane_curvature(np.array([1.0, 0.0]), 10.0),
+                         float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for HybridLaneDetector
+"""
+
+import threading
+import unittest
+import cv2
+import numpy as np
+from dl_models.dl_lane_detector import DLLaneDetector
+from dl_models.hybrid_lane_detector import HybridLaneDetector
+from dl_models.lane_detection_result import LaneDetectionResult
+
+
+class _StubDetector(DLLaneDetector):
+    """DL detector returning fixed lanes and counting calls"""
+    
+    def __init__(self):
+        super().__init__('model.onnx', 'onnx', 'cpu')
+        self.is_loaded = True
+        self.calls = 0
+    
+    def load_model(self):
+        return True
+    
+    def detect_lanes(self, frame):
+        self.calls += 1
+        return LaneDetectionResult(
+            left_lane=np.array([100, 480, 250, 288]),
+            right_lane=np.array([540, 480, 390, 288]),
+            confidence=0.9,
+            success=True
+        )
+    
+    def postprocess_output(self, model_output, original_shape):
+        return {}
+
+
+class _GatedStubDetector(_StubDetector):
+    """Stub whose calls after the first block until the gate is opened"""
+    
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+    
+    def detect_lanes(self, frame):
+        if self.calls > 0:
+            self.gate.wait()
+        return super().detect_lanes(frame)
+
+
+class TestHybridLaneDetector(unittest.TestCase):
+    """Test hybrid DL/CV lane detection"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.dl_detector = _StubDetector()
+        self.detector = HybridLaneDetector(self.dl_detector)
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.line(self.frame, (100, 480), (250, 288), (255, 255, 255), 5)
+        cv2.line(self.frame, (540, 480), (390, 288), (255, 255, 255), 5)
+    
+    def tearDown(self):
+        """Stop the DL worker"""
+        self.detector.shutdown()
+    
+    def _detect(self, frame):
+        """Run one frame and wait for the background DL call to finish"""
+        lanes = self.detector.detect_lanes(frame)
+        if self.detector._dl_future is not None:
+            self.detector._dl_future.result()
+        return lanes
+    
+    def test_dl_runs_on_keyframes_only(self):
+        """Test DL model is not called on tracked frames"""
+        for _ in range(6):
+            self._detect(self.frame)
+        
+        # Frame 0 submits, frame 1 picks up the result, frames 2, 4 and 5 track
+        self.assertEqual(self.dl_detector.calls, 3)
+        self.assertEqual(self.detector.get_statistics()['tracked_count'], 3)
+    
+    def test_first_frame_falls_back_while_dl_runs(self):
+        """Test the first frame doesn't wait for the DL worker"""
+        self.detector.detect_lanes(self.frame)
+        
+        self.assertEqual(self.detector.get_statistics()['dl_success_count'], 0)
+    
+    def test_tracked_lanes_follow_markings(self):
+        """Test lanes between keyframes stay on the painted markings"""
+        self._detect(self.frame)
+        self._detect(self.frame)
+        left, right, _ = self._detect(self.frame)
+        
+        self.assertIsNotNone(left)
+        self.assertIsNotNone(right)
+        self.assertLess(abs(left[0] - 100), 10)
+        self.assertLess(abs(right[0] - 540), 10)
+    
+    def test_reset_statistics_clears_tracking(self):
+        """Test reset drops cached lanes so the next frame uses DL again"""
+        self._detect(self.frame)
+        self._detect(self.frame)
+        self.detector.reset_statistics()
+        self._detect(self.frame)
+        
+        self.assertEqual(self.dl_detector.calls, 3)
+        self.assertEqual(self.detector.get_statistics()['tracked_count'], 0)
+    
+    def test_keyframe_without_new_result_keeps_tracking(self):
+        """Test a keyframe with inference still running tracks instead of reusing the old result"""
+        dl_detector = _GatedStubDetector()
+        detector = HybridLaneDetector(dl_detector)
+        try:
+            detector.detect_lanes(self.frame)
+            detector._dl_future.result()
+            # Frame 1 collects the result; the next inference blocks
+            for _ in range(3):
+                left, right, _ = detector.detect_lanes(self.frame)
+            
+            stats = detector.get_statistics()
+            self.assertEqual(stats['dl_success_count'], 1)
+            self.assertEqual(stats['tracked_count'], 2)
+            self.assertIsNotNone(left)
+            self.assertIsNotNone(right)
+        finally:
+            dl_detector.gate.set()
+            detector.shutdown()
+    
+    def test_reset_statistics_drops_pending_inference(self):
+        """Test reset forgets an inference still in flight"""
+        self.detector.detect_lanes(self.frame)
+        self.detector.reset_statistics()
+        
+        self.assertIsNone(self.detector._dl_future)
+    
+    def test_points_to_line_from_coefficients(self):
+        """Test quadratic and linear coefficients are evaluated at both ends"""
+        quadratic = self.detector._points_to_line(np.array([0.001, -0.5, 400.0]), 480)
+        linear = self.detector._points_to_line(np.array([-0.5, 400.0]), 480)
+        
+        np.testing.assert_array_equal(quadratic, [int(np.polyval([0.001, -0.5, 400.0], 480)), 480,
+                                                  int(np.polyval([0.001, -0.5, 400.0], 288)), 288])
+        np.testing.assert_array_equal(linear, [160, 480, 256, 288])
+
+
+if __name__ == '__main__':
+    unittest.main()
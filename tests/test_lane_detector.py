@@ -0,0 +1,98 @@
+"""
+Unit tests for the traditional CV LaneDetector
+"""
+
+import unittest
+import numpy as np
+import cv2
+from lane_detector import LaneDetector
+
+
+class TestLaneDetector(unittest.TestCase):
+    """Test LaneDetector"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.detector = LaneDetector()
+        self.height = 720
+        self.width = 1280
+    
+    def test_separate_lanes_none(self):
+        """Test no Hough lines gives no lanes"""
+        self.assertEqual(self.detector._separate_lanes(None, self.width, self.height), (None, None))
+    
+    def test_separate_lanes_splits_by_slope(self):
+        """Test lines are split by slope sign and shallow/vertical lines dropped"""
+        lines = np.array([
+            [[200, 720, 500, 432]],   # left, slope -0.96
+            [[210, 720, 510, 430]],   # left
+            [[1080, 720, 780, 432]],  # right, slope 0.96
+            [[100, 500, 600, 520]],   # too shallow
+            [[640, 720, 640, 400]],   # vertical
+        ], dtype=np.int32)
+        
+        left, right = self.detector._separate_lanes(lines, self.width, self.height)
+        
+        slopes = np.array([(432 - 720) / 300, (430 - 720) / 300])
+        intercepts = np.array([720, 720]) - slopes * np.array([200, 210])
+        expected_x1 = int((720 - intercepts.mean()) / slopes.mean())
+        self.assertEqual(left[0], expected_x1)
+        self.assertEqual(left[1], self.height)
+        self.assertEqual(left[3], int(self.height * 0.6))
+        self.assertEqual(right[0], 1080)
+    
+    def test_separate_lanes_one_side(self):
+        """Test a missing side is None"""
+        lines = np.array([[[200, 720, 500, 432]]], dtype=np.int32)
+        
+        left, right = self.detector._separate_lanes(lines, self.width, self.height)
+        
+        self.assertIsNotNone(left)
+        self.assertIsNone(right)
+    
+    def test_average_lines_accepts_list(self):
+        """Test _average_lines on a plain list of lines"""
+        lane = self.detector._average_lines([[200, 720, 500, 432], [640, 0, 640, 10]], self.height)
+        
+        self.assertEqual(lane[0], 200)
+        self.assertIsNone(self.detector._average_lines([], self.height))
+    
+    def test_detect_lanes(self):
+        """Test detection on a synthetic road frame"""
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        cv2.line(frame, (250, 720), (590, 440), (255, 255, 255), 8)
+        cv2.line(frame, (1030, 720), (690, 440), (255, 255, 255), 8)
+        
+        left, right, processed = self.detector.detect_lanes(frame)
+        
+        self.assertIsNotNone(left)
+        self.assertIsNotNone(right)
+        self.assertLess(left[0], self.width // 2)
+        self.assertGreater(right[0], self.width // 2)
+        self.assertEqual(processed.shape, frame.shape)
+    
+    def test_roi_mask_cached_per_size(self):
+        """Test the ROI mask is built once per frame size"""
+        mask = self.detector._roi_mask(self.height, self.width)
+        
+        self.assertIs(self.detector._roi_mask(self.height, self.width), mask)
+        self.assertIsNot(self.detector._roi_mask(480, 640), mask)
+        self.assertEqual(mask.shape, (self.height, self.width))
+        self.assertEqual(mask[self.height - 1, self.width // 2], 255)
+        self.assertEqual(mask[0, 0], 0)
+    
+    def test_detect_lanes_opencl_matches_cpu(self):
+        """Test the UMat preprocessing finds the same lanes as the CPU path"""
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        cv2.line(frame, (250, 720), (590, 440), (255, 255, 255), 8)
+        cv2.line(frame, (1030, 720), (690, 440), (255, 255, 255), 8)
+        
+        cpu_left, cpu_right, _ = self.detector.detect_lanes(frame)
+        left, right, _ = LaneDetector(use_opencl=True).detect_lanes(frame)
+        
+        np.testing.assert_array_equal(left, cpu_left)
+        np.testing.assert_array_equal(right, cpu_right)
+
+
+if __name__ == '__main__':
+    unittest.main()
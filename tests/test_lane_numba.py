@@ -0,0 +1,96 @@
+"""
+Unit tests for lane_numba kernels
+"""
+
+import unittest
+import numpy as np
+from dl_models import lane_numba
+
+
+class TestLaneNumba(unittest.TestCase):
+    """Test compiled lane geometry kernels against NumPy"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        rng = np.random.default_rng(0)
+        self.y = np.linspace(360, 1080, 30)
+        self.x = 0.0004 * self.y ** 2 - 0.3 * self.y + 500 + rng.normal(0, 2, self.y.shape)
+    
+    def test_polyfit_quadratic_matches_numpy(self):
+        """Test quadratic fit matches np.polyfit"""
+        coeffs = lane_numba.polyfit_quadratic(self.y, self.x)
+        
+        np.testing.assert_allclose(coeffs, np.polyfit(self.y, self.x, 2), rtol=1e-6, atol=1e-6)
+    
+    def test_polyfit_quadratic_singular(self):
+        """Test singular input returns NaN coefficients"""
+        y = np.full(5, 100.0)
+        coeffs = lane_numba.polyfit_quadratic(y, np.arange(5.0))
+        
+        self.assertTrue(np.all(np.isnan(coeffs)))
+    
+    def test_polyfit_linear_matches_numpy(self):
+        """Test linear fit matches np.polyfit"""
+        coeffs = lane_numba.polyfit_linear(self.y, self.x)
+        
+        np.testing.assert_allclose(coeffs, np.polyfit(self.y, self.x, 1), rtol=1e-6)
+    
+    def test_fit_quadratic_two_points_is_linear(self):
+        """Test two points produce the line through them"""
+        coeffs = lane_numba.fit_quadratic(np.array([100.0, 200.0]), np.array([10.0, 30.0]))
+        
+        np.testing.assert_allclose(coeffs, [0.0, 0.2, -10.0], atol=1e-9)
+    
+    def test_fit_quadratic_degenerate(self):
+        """Test identical y values give no fit"""
+        coeffs = lane_numba.fit_quadratic(np.full(4, 50.0), np.arange(4.0))
+        
+        self.assertTrue(np.all(np.isnan(coeffs)))
+    
+    def test_fit_quadratic_accepts_int_points(self):
+        """Test wrapper converts integer input"""
+        coeffs = lane_numba.fit_quadratic(self.y.astype(np.int32), self.x.astype(np.int32))
+        
+        self.assertEqual(len(coeffs), 3)
+        self.assertTrue(np.all(np.isfinite(coeffs)))
+    
+    def test_curvature_radius_treats_tiny_quadratic_as_line(self):
+        """Test near-zero second derivative gives an infinite radius"""
+        self.assertAlmostEqual(lane_numba.curvature_radius(0.5, 0.0, 0.0), 1.0)
+        self.assertEqual(lane_numba.curvature_radius(1e-8, 0.5, 100.0), float('inf'))
+    
+    def test_horner(self):
+        """Test Horner evaluation matches np.polyval for any degree"""
+        for coeffs in ([3.0], [0.5, 100.0], [0.001, 0.5, 100.0], [1e-6, 0.001, 0.5, 100.0]):
+            coeffs = np.array(coeffs)
+            self.assertAlmostEqual(lane_numba.horner(coeffs, 540.0), np.polyval(coeffs, 540.0))
+    
+    def test_lane_in_bounds(self):
+        """Test bounds and sharpness checks"""
+        self.assertTrue(lane_numba.lane_in_bounds(np.array([0.0001, 0.5, 960.0]), 1920.0, 1080.0, 50.0))
+        self.assertFalse(lane_numba.lane_in_bounds(np.array([0.5, 5000.0]), 1920.0, 1080.0, 50.0))
+        self.assertFalse(lane_numba.lane_in_bounds(np.array([0.02, -34.56, 15829.92]), 1920.0, 1080.0, 50.0))
+    
+    def test_lane_in_bounds_matches_reference(self):
+        """Test the fused check agrees with separate evaluation and curvature"""
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            coeffs = np.array([rng.normal(0, 0.003), rng.normal(0, 1.5), rng.uniform(-400, 2300)])
+            x_bottom = np.polyval(coeffs, 1080.0)
+            x_top = np.polyval(coeffs, 648.0)
+            expected = (-384.0 <= x_bottom <= 2304.0 and -384.0 <= x_top <= 2304.0
+                        and lane_numba.curvature_radius(coeffs[0], coeffs[1], 864.0) >= 50.0)
+            
+            self.assertEqual(lane_numba.lane_in_bounds(coeffs, 1920.0, 1080.0, 50.0), expected)
+    
+    def test_scale_points(self):
+        """Test point scaling returns a scaled copy"""
+        points = np.array([[10.0, 20.0], [30.0, 40.0]], dtype=np.float32)
+        scaled = lane_numba.scale_points(points, 2.0, 0.5)
+        
+        np.testing.assert_allclose(scaled, [[20.0, 10.0], [60.0, 20.0]])
+        self.assertEqual(points[0, 0], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
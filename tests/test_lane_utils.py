@@ -35,6 +35,16 @@ class TestLaneUtils(unittest.TestCase):
         self.assertIsNotNone(coeffs)
         self.assertEqual(len(coeffs), 2)  # Linear has 2 coefficients
     
+    def test_fit_lane_polynomial_matches_polyfit(self):
+        """Test closed-form fits match np.polyfit and skip non-finite points"""
+        points = np.vstack([self.lane_points, [[np.nan, 200], [400, np.inf]]])
+        x = self.lane_points[:, 0].astype(np.float64)
+        y = self.lane_points[:, 1].astype(np.float64)
+        
+        for degree in (1, 2, 3):
+            coeffs = lane_utils.fit_lane_polynomial(points, degree=degree)
+            np.testing.assert_allclose(coeffs, np.polyfit(y, x, degree), rtol=1e-6, atol=1e-9)
+    
     def test_calculate_curvature(self):
         """Test curvature calculation"""
         coeffs = np.array([0.001, 0.5, 100])  # Quadratic coefficients
@@ -54,6 +64,15 @@ class TestLaneUtils(unittest.TestCase):
         self.assertIsNotNone(x_values)
         self.assertEqual(len(x_values), 3)
     
+    def test_evaluate_polynomial_scalar_and_2d(self):
+        """Test evaluation of scalars and 2D arrays matches np.polyval"""
+        coeffs = np.array([0.001, 0.5, 100])
+        y_grid = np.arange(12, dtype=np.float64).reshape(3, 4) * 50
+        
+        self.assertAlmostEqual(lane_utils.evaluate_polynomial(coeffs, 540), np.polyval(coeffs, 540))
+        np.testing.assert_allclose(lane_utils.evaluate_polynomial(coeffs, y_grid),
+                                   np.polyval(coeffs, y_grid))
+    
     def test_generate_lane_points(self):
         """Test lane point generation"""
         coeffs = np.array([0.001, 0.5, 100])
@@ -64,6 +83,39 @@ class TestLaneUtils(unittest.TestCase):
         self.assertEqual(points.shape[0], 50)
         self.assertEqual(points.shape[1], 2)
     
+    def test_generate_lane_points_match_polyval(self):
+        """Test generated x values match np.polyval"""
+        coeffs = np.array([0.001, 0.5, 100])
+        
+        points = lane_utils.generate_lane_points(coeffs, 1080, 540, num_points=10)
+        
+        np.testing.assert_allclose(points[:, 1], np.linspace(1080, 540, 10))
+        np.testing.assert_allclose(points[:, 0], np.polyval(coeffs, points[:, 1]))
+        np.testing.assert_allclose(lane_utils.evaluate_polynomial(coeffs, points[:, 1]), points[:, 0])
+        self.assertTrue(points.flags['C_CONTIGUOUS'])
+        self.assertEqual(points[-1, 1], 540)
+    
+    def test_generate_lane_pair_points(self):
+        """Test both lanes are evaluated into one reusable buffer"""
+        left_poly = np.array([0.001, 0.5, 100])
+        right_poly = np.array([0.5, 900])
+        out = np.empty((20, 2, 2))
+        
+        points = lane_utils.generate_lane_pair_points(left_poly, right_poly, 1080, 540,
+                                                      num_points=20, out=out)
+        
+        self.assertIs(points, out)
+        np.testing.assert_allclose(points[:, 0], lane_utils.generate_lane_points(left_poly, 1080, 540, 20))
+        np.testing.assert_allclose(points[:, 1], lane_utils.generate_lane_points(right_poly, 1080, 540, 20))
+    
+    def test_cached_linspace_is_shared_and_read_only(self):
+        """Test repeated y ranges reuse one read-only linspace"""
+        first = lane_utils._cached_linspace(1080.0, 540.0, 20)
+        
+        self.assertIs(lane_utils._cached_linspace(1080.0, 540.0, 20), first)
+        self.assertFalse(first.flags.writeable)
+        np.testing.assert_array_equal(first, np.linspace(1080, 540, 20))
+    
     def test_calculate_lane_width(self):
         """Test lane width calculation"""
         left_poly = np.array([0.001, 0.5, 100])
@@ -74,6 +126,36 @@ class TestLaneUtils(unittest.TestCase):
         self.assertIsNotNone(width)
         self.assertGreater(width, 0)
     
+    def test_analyze_lane_pair_matches_helpers(self):
+        """Test the fused lane pair analysis matches the individual helpers"""
+        y = np.linspace(600, 1080, 20)
+        left = np.column_stack((0.0002 * y ** 2 - 0.4 * y + 700, y))
+        right = np.column_stack((-0.0001 * y ** 2 + 0.3 * y + 1000, y))
+        left_poly = lane_utils.fit_lane_polynomial(left)
+        right_poly = lane_utils.fit_lane_polynomial(right)
+        
+        result = lane_utils.analyze_lane_pair(left, right, 1920, 1080)
+        
+        np.testing.assert_allclose(result['left_poly'], left_poly)
+        np.testing.assert_allclose(result['right_poly'], right_poly)
+        self.assertAlmostEqual(result['left_curvature'], lane_utils.calculate_curvature(left_poly, 1080))
+        self.assertAlmostEqual(result['lane_width'],
+                               lane_utils.calculate_lane_width(left_poly, right_poly, 1080))
+        self.assertTrue(result['left_valid'])
+        self.assertTrue(result['right_valid'])
+    
+    def test_analyze_lane_pair_missing_lane(self):
+        """Test a missing lane has no fit, width or validity"""
+        y = np.linspace(600, 1080, 20)
+        right = np.column_stack((0.3 * y + 1000, y))
+        
+        result = lane_utils.analyze_lane_pair(None, right, 1920, 1080)
+        
+        self.assertIsNone(result['left_poly'])
+        self.assertFalse(result['left_valid'])
+        self.assertIsNone(result['lane_width'])
+        self.assertIsNotNone(result['right_poly'])
+    
     def test_smooth_lane_polynomial(self):
         """Test polynomial smoothing"""
         poly_history = [
@@ -87,6 +169,34 @@ class TestLaneUtils(unittest.TestCase):
         self.assertIsNotNone(smoothed)
         self.assertEqual(len(smoothed), 3)
     
+    def test_poly_history_matches_smooth_lane_polynomial(self):
+        """Test the ring buffer average matches the list-based smoothing"""
+        rng = np.random.default_rng(0)
+        history = lane_utils.PolyHistory(window_size=3)
+        polys = []
+        
+        for i in range(10):
+            poly = None if i % 4 == 3 else rng.normal(size=3)
+            polys.append(poly)
+            history.push(poly)
+            
+            expected = lane_utils.smooth_lane_polynomial(polys, window_size=3)
+            np.testing.assert_allclose(history.smoothed(), expected)
+    
+    def test_poly_history_empty(self):
+        """Test an empty or all-None window has no average"""
+        history = lane_utils.PolyHistory(window_size=2)
+        self.assertIsNone(history.smoothed())
+        
+        history.push(np.array([0.001, 0.5, 100]))
+        history.push(None)
+        history.push(None)
+        self.assertIsNone(history.smoothed())
+        
+        history.push(np.array([0.001, 0.5, 100]))
+        history.clear()
+        self.assertIsNone(history.smoothed())
+    
     def test_validate_lane_polynomial(self):
         """Test polynomial validation"""
         # Use a polynomial that produces reasonable x values
@@ -104,6 +214,11 @@ class TestLaneUtils(unittest.TestCase):
         
         self.assertIsNotNone(coeffs)
         self.assertEqual(len(coeffs), 2)  # Linear
+        np.testing.assert_allclose(coeffs, np.polyfit([1080, 540], [100, 300], 1))
+    
+    def test_convert_horizontal_line_to_polynomial(self):
+        """Test a horizontal line has no polynomial"""
+        self.assertIsNone(lane_utils.convert_line_to_polynomial(np.array([100, 500, 300, 500])))
 
 
 if __name__ == '__main__':
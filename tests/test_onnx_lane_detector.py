@@ -0,0 +1,92 @@
+"""
+Unit tests for ONNXLaneDetector model selection
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from dl_models.onnx_lane_detector import ONNXLaneDetector
+
+
+class TestONNXModelSelection(unittest.TestCase):
+    """Test precision-specific model path selection"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fp32_path = os.path.join(self.tmpdir.name, 'lane.fp32.onnx')
+        open(self.fp32_path, 'wb').close()
+        self.detector = ONNXLaneDetector(self.fp32_path)
+    
+    def tearDown(self):
+        """Clean up temporary files"""
+        self.tmpdir.cleanup()
+    
+    def _touch(self, name):
+        path = os.path.join(self.tmpdir.name, name)
+        open(path, 'wb').close()
+        return path
+    
+    def test_fp32_requested(self):
+        """Test explicit FP32 keeps the original model"""
+        self._touch('lane.int8.onnx')
+        self.detector.precision = 'fp32'
+        
+        self.assertEqual(self.detector._select_model_path(on_cuda=False), self.fp32_path)
+        self.assertEqual(self.detector.precision, 'fp32')
+    
+    def test_auto_prefers_existing_int8_on_cpu(self):
+        """Test auto precision picks the INT8 sibling on CPU"""
+        int8_path = self._touch('lane.int8.onnx')
+        
+        self.assertEqual(self.detector._select_model_path(on_cuda=False), int8_path)
+        self.assertEqual(self.detector.precision, 'int8')
+    
+    def test_auto_prefers_existing_fp16_on_cuda(self):
+        """Test auto precision picks the FP16 sibling on CUDA"""
+        fp16_path = self._touch('lane.fp16.onnx')
+        
+        self.assertEqual(self.detector._select_model_path(on_cuda=True), fp16_path)
+        self.assertEqual(self.detector.precision, 'fp16')
+    
+    def test_missing_fp16_falls_back(self):
+        """Test a missing FP16 model falls back to FP32"""
+        self.assertEqual(self.detector._select_model_path(on_cuda=True), self.fp32_path)
+        self.assertEqual(self.detector.precision, 'fp32')
+    
+    def test_plain_model_name_unchanged(self):
+        """Test models not named *.fp32.onnx are loaded as given"""
+        path = self._touch('lane.onnx')
+        detector = ONNXLaneDetector(path, precision='int8')
+        
+        self.assertEqual(detector._select_model_path(on_cuda=False), path)
+
+
+
+class TestONNXPostprocess(unittest.TestCase):
+    """Test generic output postprocessing"""
+    
+    def test_nonzero_rows(self):
+        """Test the point filter matches np.any over the coordinates"""
+        points = np.array([[0, 0], [3, 0], [0, 4], [5, 6], [0, 0]], dtype=np.float32)
+        
+        mask = ONNXLaneDetector._nonzero_rows(points)
+        
+        np.testing.assert_array_equal(mask, np.any(points != 0, axis=1))
+    
+    def test_postprocess_drops_zero_points(self):
+        """Test padded zero points are dropped from both lanes"""
+        detector = ONNXLaneDetector('missing.onnx')
+        output = np.zeros((1, 2, 4, 2), dtype=np.float32)
+        output[0, 0, :2] = [[100, 50], [120, 100]]
+        output[0, 1, :3] = [[600, 50], [620, 100], [640, 150]]
+        
+        result = detector.postprocess_output([output], (288, 800))
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['left_lane']), 2)
+        self.assertEqual(len(result['right_lane']), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -68,6 +68,49 @@ class TestAdvancedOverlayRenderer(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result.shape, self.frame.shape)
     
+    def test_draw_lane_polygon_gradient_blend(self):
+        """Test the polygon is blended with the vertical gradient alpha"""
+        frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+        left_lane = np.array([100, 480, 250, 240])
+        right_lane = np.array([540, 480, 390, 240])
+        
+        result = self.renderer.draw_lane_polygon(frame.copy(), left_lane, right_lane)
+        
+        alpha = self.renderer.create_gradient_mask(480, 1, start_alpha=0.3, end_alpha=0.09)
+        for y in (250, 400, 479):
+            expected = 100 * (1 - alpha[y, 0]) + np.array([0, 255, 0]) * alpha[y, 0]
+            np.testing.assert_allclose(result[y, 320], expected, atol=1)
+        # Outside the polygon the frame is untouched
+        self.assertTrue(np.array_equal(result[:240], frame[:240]))
+        self.assertTrue(np.array_equal(result[470, :50], frame[470, :50]))
+    
+    def test_draw_lane_polygon_reuses_blend(self):
+        """Test unchanged lanes reuse the cached blend and give the same result"""
+        frame = np.random.randint(0, 256, (480, 640, 3), dtype=np.uint8)
+        left_lane = np.array([100, 480, 250, 240])
+        right_lane = np.array([540, 480, 390, 240])
+        
+        first = self.renderer.draw_lane_polygon(frame.copy(), left_lane, right_lane)
+        blend = self.renderer._polygon_blend
+        second = self.renderer.draw_lane_polygon(frame.copy(), left_lane.copy(), right_lane.copy())
+        
+        self.assertIs(self.renderer._polygon_blend, blend)
+        self.assertTrue(np.array_equal(first, second))
+        
+        # Moved lanes rebuild the weights
+        self.renderer.draw_lane_polygon(frame.copy(), left_lane + 10, right_lane)
+        self.assertIsNot(self.renderer._polygon_blend, blend)
+    
+    def test_lane_to_points_polynomial(self):
+        """Test polynomial lanes are sampled like np.polyval"""
+        coeffs = np.array([0.0002, -0.4, 900.0])
+        
+        points = self.renderer._lane_to_points(coeffs, 1080, num_points=20)
+        
+        self.assertEqual(points.shape, (20, 2))
+        np.testing.assert_allclose(points[:, 1], np.linspace(1080, 648, 20))
+        np.testing.assert_allclose(points[:, 0], np.polyval(coeffs, points[:, 1]))
+    
     def test_draw_distance_markers(self):
         """Test distance marker drawing"""
         detections = [
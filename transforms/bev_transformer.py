@@ -18,7 +18,8 @@ class BirdEyeViewTransformer:
     
     def __init__(self, src_points: Optional[np.ndarray] = None,
                  dst_points: Optional[np.ndarray] = None,
-                 output_size: Tuple[int, int] = (300, 400)):
+                 output_size: Tuple[int, int] = (300, 400),
+                 use_opencl: bool = False):
         """
         Initialize BEV Transformer
         
@@ -26,8 +27,10 @@ class BirdEyeViewTransformer:
             src_points: Source points in original image (4x2 array)
             dst_points: Destination points in BEV (4x2 array)
             output_size: BEV output size (width, height)
+            use_opencl: Run the warp through OpenCV's OpenCL (UMat) path
         """
         self.output_size = output_size
+        self.use_opencl = use_opencl
         self.src_points = src_points
         self.dst_points = dst_points
         
@@ -35,6 +38,10 @@ class BirdEyeViewTransformer:
         self.M = None  # Forward transform
         self.M_inv = None  # Inverse transform
         
+        # Per-pixel source lookup for the BEV image, so the warp is a plain remap
+        self._map1 = None
+        self._map2 = None
+        
         # Calculate transform if points provided
         if src_points is not None and dst_points is not None:
             self.calculate_transform_matrix()
@@ -88,6 +95,8 @@ class BirdEyeViewTransformer:
             # Calculate inverse transform
             self.M_inv = cv2.getPerspectiveTransform(self.dst_points, self.src_points)
             
+            self._build_remap_maps()
+            
             logger.debug("Transformation matrices calculated")
             return self.M
         
@@ -95,6 +104,28 @@ class BirdEyeViewTransformer:
             logger.error(f"Error calculating transformation matrix: {e}")
             return None
     
+    def _build_remap_maps(self):
+        """
+        Precompute where each BEV pixel samples the camera frame
+        
+        The points are fixed for a video, so the per-pixel perspective divide
+        is done once here; maps are stored in OpenCV's fixed-point format,
+        which remap reads fastest.
+        """
+        bev_width, bev_height = self.output_size
+        u, v = np.meshgrid(np.arange(bev_width, dtype=np.float64),
+                           np.arange(bev_height, dtype=np.float64))
+        
+        m = self.M_inv
+        w = m[2, 0] * u + m[2, 1] * v + m[2, 2]
+        map_x = ((m[0, 0] * u + m[0, 1] * v + m[0, 2]) / w).astype(np.float32)
+        map_y = ((m[1, 0] * u + m[1, 1] * v + m[1, 2]) / w).astype(np.float32)
+        
+        self._map1, self._map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        if self.use_opencl:
+            # Upload the maps once; only the frame goes to the device per call
+            self._map1, self._map2 = cv2.UMat(self._map1), cv2.UMat(self._map2)
+    
     def transform_frame(self, frame: np.ndarray) -> Optional[np.ndarray]:
         """
         Transform frame to bird's eye view
@@ -115,13 +146,11 @@ class BirdEyeViewTransformer:
                 return None
         
         try:
-            # Apply perspective warp
-            bev_frame = cv2.warpPerspective(
-                frame,
-                self.M,
-                self.output_size,
-                flags=cv2.INTER_LINEAR
-            )
+            # Apply perspective warp through the precomputed lookup
+            if self.use_opencl:
+                # Only the small BEV image is downloaded again
+                return cv2.remap(cv2.UMat(frame), self._map1, self._map2, cv2.INTER_LINEAR).get()
+            bev_frame = cv2.remap(frame, self._map1, self._map2, cv2.INTER_LINEAR)
             
             return bev_frame
         
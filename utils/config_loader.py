@@ -80,7 +80,8 @@ class ConfigLoader:
                     'model_path': 'models/ultra_fast_lane.onnx',
                     'model_type': 'onnx',
                     'confidence_threshold': 0.6,
-                    'device': 'auto'
+                    'device': 'auto',
+                    'precision': 'auto'
                 },
                 'object_detection': {
                     'model_path': 'yolov8n.pt',
@@ -119,6 +120,8 @@ class ConfigLoader:
             'performance': {
                 'target_fps': 15,
                 'max_latency_ms': 100,
+                'batch_size': 4,
+                'proc_width': 640,
                 'enable_frame_skip': True,
                 'enable_performance_mode': False
             },
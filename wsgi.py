@@ -0,0 +1,27 @@
+"""
+WSGI entry point for the enhanced web application (enhanced_app.py)
+
+Serve it with gunicorn instead of the Werkzeug development server:
+
+    gunicorn -k gthread -w 1 --threads 32 --timeout 60 -b 0.0.0.0:5000 wsgi:application
+
+Flask-SocketIO needs a single worker. The decode/infer/encode pipeline runs
+on OS threads, so the threaded worker is used rather than eventlet/gevent,
+whose monkey-patching would turn those threads into greenlets and let
+inference stall every socket and HTTP request.
+"""
+
+import os
+
+from enhanced_app import app, socketio, init_enhanced_adas
+
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+# Load the models when the worker starts rather than on the first request
+init_enhanced_adas()
+
+application = app
+
+
+if __name__ == '__main__':
+    socketio.run(app, host='0.0.0.0', port=5000)